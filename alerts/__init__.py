@@ -1,2 +1,3 @@
 # Alerts module
 from .notifications import *
+from .async_notifications import *
@@ -0,0 +1,143 @@
+"""
+Async notification module - Discord & Telegram alerts over httpx
+Use from async code (e.g. the async scraper) to fan out webhooks without
+blocking the event loop.
+"""
+import asyncio
+import weakref
+
+from .notifications import _discord_payload, _telegram_payload, _send_all, _dumps, _JSON_HEADERS
+
+# Try importing httpx for async delivery
+try:
+    import httpx
+    HAS_HTTPX = True
+except ImportError:
+    HAS_HTTPX = False
+
+# HTTP/2 needs the h2 extra (pip install httpx[http2])
+try:
+    import h2
+    HAS_HTTP2 = True
+except ImportError:
+    HAS_HTTP2 = False
+
+# httpx clients are bound to the loop they first run on, so keep one per loop
+_CLIENTS = weakref.WeakKeyDictionary()
+
+def _new_client():
+    if not HAS_HTTPX:
+        raise ImportError("httpx required for async alerts. Run: pip install httpx")
+    
+    return httpx.AsyncClient(
+        http2=HAS_HTTP2,
+        timeout=10,
+        limits=httpx.Limits(max_keepalive_connections=8)
+    )
+
+def _get_client():
+    """Long-lived client for the running event loop."""
+    loop = asyncio.get_running_loop()
+    client = _CLIENTS.get(loop)
+    if client is None or client.is_closed:
+        client = _new_client()
+        _CLIENTS[loop] = client
+    return client
+
+async def close_async_client():
+    """Close the running loop's shared client (call before the loop shuts down)."""
+    client = _CLIENTS.pop(asyncio.get_running_loop(), None)
+    if client is not None:
+        await client.aclose()
+
+async def send_discord_alert_async(webhook_url, title, message, posts=None, color=0x5865F2, client=None):
+    """
+    Send alert to Discord via webhook without blocking the event loop.
+    
+    Args:
+        webhook_url: Discord webhook URL
+        title: Alert title
+        message: Alert message
+        posts: Optional list of posts to include
+        color: Embed color (default: Discord blue)
+        client: Optional httpx.AsyncClient (default: shared per-loop client)
+    """
+    if not webhook_url:
+        print("⚠️ Discord webhook URL not configured")
+        return False
+    
+    client = client or _get_client()
+    
+    try:
+        payload = _discord_payload(title, message, posts, color)
+        response = await client.post(webhook_url, content=_dumps(payload), headers=_JSON_HEADERS)
+        if response.status_code == 204:
+            print("✅ Discord alert sent!")
+            return True
+        else:
+            print(f"❌ Discord error: {response.status_code}")
+            return False
+    except Exception as e:
+        print(f"❌ Discord error: {e}")
+        return False
+
+async def send_telegram_alert_async(bot_token, chat_id, title, message, posts=None, client=None):
+    """
+    Send alert to Telegram via bot without blocking the event loop.
+    
+    Args:
+        bot_token: Telegram bot token
+        chat_id: Chat/Channel ID to send to
+        title: Alert title
+        message: Alert message
+        posts: Optional list of posts to include
+        client: Optional httpx.AsyncClient (default: shared per-loop client)
+    """
+    if not bot_token or not chat_id:
+        print("⚠️ Telegram credentials not configured")
+        return False
+    
+    client = client or _get_client()
+    url = f"https://api.telegram.org/bot{bot_token}/sendMessage"
+    
+    try:
+        payload = _telegram_payload(chat_id, title, message, posts)
+        response = await client.post(url, content=_dumps(payload), headers=_JSON_HEADERS)
+        if response.status_code == 200:
+            print("✅ Telegram alert sent!")
+            return True
+        else:
+            print(f"❌ Telegram error: {response.json()}")
+            return False
+    except Exception as e:
+        print(f"❌ Telegram error: {e}")
+        return False
+
+async def send_alerts_async(title, message, posts=None, webhook_url=None, telegram_token=None,
+                            telegram_chat=None, color=0x5865F2, client=None):
+    """Send one alert to every configured provider concurrently."""
+    sends = []
+    if webhook_url:
+        sends.append(send_discord_alert_async(webhook_url, title, message, posts, color, client))
+    if telegram_token and telegram_chat:
+        sends.append(send_telegram_alert_async(telegram_token, telegram_chat, title, message, posts, client))
+    
+    return list(await asyncio.gather(*sends))
+
+def send_alerts(title, message, posts=None, webhook_url=None, telegram_token=None,
+                telegram_chat=None, color=0x5865F2):
+    """
+    Blocking wrapper around send_alerts_async for sync callers.
+    
+    Falls back to the threaded requests path when httpx is not installed.
+    Must not be called from inside a running event loop.
+    """
+    if not HAS_HTTPX:
+        return _send_all(title, message, posts, webhook_url, telegram_token, telegram_chat, color)
+    
+    async def run():
+        async with _new_client() as client:
+            return await send_alerts_async(title, message, posts, webhook_url,
+                                           telegram_token, telegram_chat, color, client)
+    
+    return asyncio.run(run())
@@ -2,29 +2,65 @@
 Notification module - Discord & Telegram alerts
 """
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 import json
+import re
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor, wait, ALL_COMPLETED
 from datetime import datetime
+from functools import lru_cache
 
-def send_discord_alert(webhook_url, title, message, posts=None, color=0x5865F2):
-    """
-    Send alert to Discord via webhook.
-    
-    Args:
-        webhook_url: Discord webhook URL
-        title: Alert title
-        message: Alert message
-        posts: Optional list of posts to include
-        color: Embed color (default: Discord blue)
-    """
-    if not webhook_url:
-        print("⚠️ Discord webhook URL not configured")
-        return False
-    
+# Try importing pyahocorasick for single-pass keyword scanning
+try:
+    import ahocorasick
+    HAS_AHOCORASICK = True
+except ImportError:
+    HAS_AHOCORASICK = False
+
+# Try importing orjson for faster payload encoding
+try:
+    import orjson
+    HAS_ORJSON = True
+except ImportError:
+    HAS_ORJSON = False
+
+def _dumps(payload):
+    """Encode a webhook payload to JSON (orjson when available)."""
+    if HAS_ORJSON:
+        return orjson.dumps(payload)
+    return json.dumps(payload).encode('utf-8')
+
+_JSON_HEADERS = {"Content-Type": "application/json"}
+
+# Shared keep-alive session so repeated alerts reuse TLS connections.
+# Webhook sends are POSTs, so they have to be opted in to retries, and only
+# where the message certainly wasn't delivered: connection failures before
+# the request went out, and 429s (honouring the Retry-After header both
+# providers send). Read timeouts and 5xx may follow an accepted message,
+# so they are not retried, to avoid duplicate alerts.
+_RETRY = Retry(
+    total=3,
+    read=0,
+    other=0,
+    backoff_factor=0.3,
+    status_forcelist=[429],
+    allowed_methods=frozenset(["POST"]),
+    raise_on_status=False
+)
+_SESSION = requests.Session()
+_SESSION.mount("https://", HTTPAdapter(pool_connections=4, pool_maxsize=16, max_retries=_RETRY))
+
+# Discord and Telegram are independent round-trips; send them side by side
+_EXECUTOR = ThreadPoolExecutor(max_workers=4, thread_name_prefix="alerts")
+
+def _discord_payload(title, message, posts=None, color=0x5865F2, timestamp=None):
+    """Build the Discord webhook JSON body."""
     embeds = [{
         "title": f"🤖 {title}",
         "description": message,
         "color": color,
-        "timestamp": datetime.utcnow().isoformat(),
+        "timestamp": timestamp or datetime.utcnow().isoformat(),
         "footer": {"text": "Reddit Scraper Alert"}
     }]
     
@@ -39,13 +75,31 @@ def send_discord_alert(webhook_url, title, message, posts=None, color=0x5865F2):
             })
         embeds[0]["fields"] = fields
     
-    payload = {"embeds": embeds}
+    return {"embeds": embeds}
+
+def send_discord_alert(webhook_url, title, message, posts=None, color=0x5865F2, timestamp=None):
+    """
+    Send alert to Discord via webhook.
+    
+    Args:
+        webhook_url: Discord webhook URL
+        title: Alert title
+        message: Alert message
+        posts: Optional list of posts to include
+        color: Embed color (default: Discord blue)
+        timestamp: Optional ISO timestamp for the embed (default: now)
+    """
+    if not webhook_url:
+        print("⚠️ Discord webhook URL not configured")
+        return False
+    
+    payload = _discord_payload(title, message, posts, color, timestamp)
     
     try:
-        response = requests.post(
+        response = _SESSION.post(
             webhook_url,
-            json=payload,
-            headers={"Content-Type": "application/json"},
+            data=_dumps(payload),
+            headers=_JSON_HEADERS,
             timeout=10
         )
         if response.status_code == 204:
@@ -58,6 +112,25 @@ def send_discord_alert(webhook_url, title, message, posts=None, color=0x5865F2):
         print(f"❌ Discord error: {e}")
         return False
 
+def _telegram_payload(chat_id, title, message, posts=None):
+    """Build the Telegram sendMessage JSON body."""
+    text = f"🤖 *{title}*\n\n{message}"
+    
+    if posts:
+        text += "\n\n📝 *New Posts:*\n"
+        for post in posts[:5]:
+            title_text = post.get('title', 'No Title')[:80]
+            score = post.get('score', 0)
+            permalink = post.get('permalink', '')
+            text += f"\n• [{title_text}](https://reddit.com{permalink}) (⬆️ {score})"
+    
+    return {
+        "chat_id": chat_id,
+        "text": text,
+        "parse_mode": "Markdown",
+        "disable_web_page_preview": True
+    }
+
 def send_telegram_alert(bot_token, chat_id, title, message, posts=None):
     """
     Send alert to Telegram via bot.
@@ -73,27 +146,11 @@ def send_telegram_alert(bot_token, chat_id, title, message, posts=None):
         print("⚠️ Telegram credentials not configured")
         return False
     
-    # Build message
-    text = f"🤖 *{title}*\n\n{message}"
-    
-    if posts:
-        text += "\n\n📝 *New Posts:*\n"
-        for post in posts[:5]:
-            title_text = post.get('title', 'No Title')[:80]
-            score = post.get('score', 0)
-            permalink = post.get('permalink', '')
-            text += f"\n• [{title_text}](https://reddit.com{permalink}) (⬆️ {score})"
-    
     url = f"https://api.telegram.org/bot{bot_token}/sendMessage"
-    payload = {
-        "chat_id": chat_id,
-        "text": text,
-        "parse_mode": "Markdown",
-        "disable_web_page_preview": True
-    }
+    payload = _telegram_payload(chat_id, title, message, posts)
     
     try:
-        response = requests.post(url, json=payload, timeout=10)
+        response = _SESSION.post(url, data=_dumps(payload), headers=_JSON_HEADERS, timeout=10)
         if response.status_code == 200:
             print("✅ Telegram alert sent!")
             return True
@@ -104,7 +161,59 @@ def send_telegram_alert(bot_token, chat_id, title, message, posts=None):
         print(f"❌ Telegram error: {e}")
         return False
 
-def check_keyword_alerts(posts, keywords, webhook_url=None, telegram_token=None, telegram_chat=None):
+def _send_all(title, message, posts=None, webhook_url=None, telegram_token=None,
+              telegram_chat=None, color=0x5865F2):
+    """Send one alert to every configured provider concurrently and wait for all."""
+    futures = []
+    if webhook_url:
+        timestamp = datetime.utcnow().isoformat()
+        futures.append(_EXECUTOR.submit(send_discord_alert, webhook_url, title, message, posts, color, timestamp))
+    if telegram_token and telegram_chat:
+        futures.append(_EXECUTOR.submit(send_telegram_alert, telegram_token, telegram_chat, title, message, posts))
+    
+    if futures:
+        wait(futures, return_when=ALL_COMPLETED)
+    return [f.result() for f in futures]
+
+@lru_cache(maxsize=32)
+def _keyword_matcher(keywords):
+    """
+    Build a matcher for a tuple of lowercased keywords.
+    
+    Returns a function mapping text to the set of keywords it contains.
+    With pyahocorasick installed this is a single automaton pass over the
+    text; otherwise one precompiled case-insensitive alternation regex.
+    """
+    words = [k for k in keywords if k]
+    if not words:
+        return lambda text: set()
+    
+    if HAS_AHOCORASICK:
+        automaton = ahocorasick.Automaton()
+        for word in words:
+            automaton.add_word(word, word)
+        automaton.make_automaton()
+        return lambda text: {word for _, word in automaton.iter(text.lower())}
+    
+    # Longest keywords first; the lookahead tries every position so
+    # overlapping keywords are found, and shorter keywords contained in a
+    # match are added back afterwards.
+    pattern = re.compile(
+        "(?=(" + "|".join(map(re.escape, sorted(words, key=len, reverse=True))) + "))",
+        re.IGNORECASE
+    )
+    contained = {w: [o for o in words if o != w and o in w] for w in words}
+    
+    def match(text):
+        found = {m.lower() for m in pattern.findall(text)}
+        for word in list(found):
+            found.update(contained.get(word, ()))
+        return found
+    
+    return match
+
+def check_keyword_alerts(posts, keywords, webhook_url=None, telegram_token=None,
+                         telegram_chat=None, matcher=None):
     """
     Check posts for keyword matches and send alerts.
     
@@ -114,25 +223,28 @@ def check_keyword_alerts(posts, keywords, webhook_url=None, telegram_token=None,
         webhook_url: Discord webhook URL
         telegram_token: Telegram bot token
         telegram_chat: Telegram chat ID
+        matcher: Optional prebuilt matcher from _keyword_matcher()
     
     Returns:
-        List of matching posts
+        List of matching posts (empty without a configured destination,
+        since nothing would be sent)
     """
     if not keywords:
         return []
     
+    if not webhook_url and not (telegram_token and telegram_chat):
+        return []
+    
     keywords_lower = [k.lower() for k in keywords]
+    if matcher is None:
+        matcher = _keyword_matcher(tuple(keywords_lower))
     matching_posts = []
     
     for post in posts:
-        text = f"{post.get('title', '')} {post.get('selftext', '')}".lower()
-        
-        matched_keywords = []
-        for keyword in keywords_lower:
-            if keyword in text:
-                matched_keywords.append(keyword)
-        
-        if matched_keywords:
+        found = matcher(f"{post.get('title', '')} {post.get('selftext', '')}")
+        if found:
+            # Keep the caller's keyword order in the result
+            matched_keywords = [k for k in keywords_lower if k in found]
             post['matched_keywords'] = matched_keywords
             matching_posts.append(post)
     
@@ -140,11 +252,8 @@ def check_keyword_alerts(posts, keywords, webhook_url=None, telegram_token=None,
         title = f"Keyword Alert: {len(matching_posts)} matches!"
         message = f"Found posts matching: {', '.join(set(k for p in matching_posts for k in p.get('matched_keywords', [])))}"
         
-        if webhook_url:
-            send_discord_alert(webhook_url, title, message, matching_posts, color=0xFF6B6B)
-        
-        if telegram_token and telegram_chat:
-            send_telegram_alert(telegram_token, telegram_chat, title, message, matching_posts)
+        _send_all(title, message, matching_posts, webhook_url,
+                  telegram_token, telegram_chat, color=0xFF6B6B)
     
     return matching_posts
 
@@ -169,32 +278,61 @@ def send_scrape_summary(subreddit, stats, webhook_url=None, telegram_token=None,
 • Duration: {stats.get('duration', 'N/A')}
     """.strip()
     
-    if webhook_url:
-        send_discord_alert(webhook_url, title, message, color=0x00D166)
-    
-    if telegram_token and telegram_chat:
-        send_telegram_alert(telegram_token, telegram_chat, title, message)
+    _send_all(title, message, None, webhook_url, telegram_token, telegram_chat, color=0x00D166)
+
+def _post_key(post_id):
+    """Compact seen-set key: base36 Reddit ids as ints, anything else unchanged."""
+    # isalnum() rules out int()'s tolerance of '_' separators ("t3_abc")
+    if isinstance(post_id, str) and post_id.isalnum():
+        try:
+            return int(post_id, 36)
+        except ValueError:
+            pass
+    return post_id
 
 class AlertMonitor:
     """Monitor for keyword-based alerts."""
     
-    def __init__(self, keywords, discord_webhook=None, telegram_token=None, telegram_chat=None):
+    def __init__(self, keywords, discord_webhook=None, telegram_token=None, telegram_chat=None,
+                 max_seen=200_000, track_when_disabled=False):
         self.keywords = keywords
         self.discord_webhook = discord_webhook
         self.telegram_token = telegram_token
         self.telegram_chat = telegram_chat
-        self.seen_posts = set()
+        self.alerts_enabled = bool(discord_webhook or (telegram_token and telegram_chat))
+        # Without a destination, skip even the seen-post bookkeeping unless asked
+        self.track_when_disabled = track_when_disabled
+        # LRU of seen post ids, capped so long-running monitors stay bounded
+        self.seen_posts = OrderedDict()
+        self.max_seen = max_seen
+        self._matcher = _keyword_matcher(tuple(k.lower() for k in keywords or ()))
     
     def check_posts(self, posts):
         """Check new posts for keyword matches."""
-        new_posts = [p for p in posts if p.get('id') not in self.seen_posts]
+        if not self.alerts_enabled and not self.track_when_disabled:
+            return []
+        
+        # One key conversion per post, reused for the lookup and the insert
+        new_posts = []
+        new_keys = []
+        for p in posts:
+            key = _post_key(p.get('id'))
+            if key in self.seen_posts:
+                self.seen_posts.move_to_end(key)
+            else:
+                new_posts.append(p)
+                new_keys.append(key)
         
         if not new_posts:
             return []
         
-        # Mark as seen
-        for p in new_posts:
-            self.seen_posts.add(p.get('id'))
+        # Mark as seen in one C-level update, then trim the oldest
+        self.seen_posts.update(dict.fromkeys(new_keys))
+        while len(self.seen_posts) > self.max_seen:
+            self.seen_posts.popitem(last=False)
+        
+        if not self.alerts_enabled:
+            return []
         
         # Check for keywords
         matches = check_keyword_alerts(
@@ -202,7 +340,8 @@ class AlertMonitor:
             self.keywords,
             self.discord_webhook,
             self.telegram_token,
-            self.telegram_chat
+            self.telegram_chat,
+            matcher=self._matcher
         )
         
         return matches
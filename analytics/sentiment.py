@@ -1,10 +1,13 @@
 """
 Analytics module - Sentiment Analysis, Word Clouds, Statistics
 """
-import re
+import heapq
 from collections import Counter
+from datetime import datetime
 from pathlib import Path
 import sys
+import numpy as np
+import pandas as pd
 
 # Simple sentiment analysis without external dependencies
 POSITIVE_WORDS = {
@@ -23,6 +26,45 @@ NEGATIVE_WORDS = {
 
 INTENSIFIERS = {'very', 'really', 'extremely', 'absolutely', 'totally', 'completely'}
 
+# One lookup per token: +1.0 positive, -1.0 negative (positive wins on overlap)
+SENTIMENT_WEIGHTS = dict.fromkeys(NEGATIVE_WORDS, -1.0)
+SENTIMENT_WEIGHTS.update(dict.fromkeys(POSITIVE_WORDS, 1.0))
+INTENSIFIER_SET = frozenset(INTENSIFIERS)
+
+# Words ignored by extract_keywords
+STOPWORDS = frozenset({
+    'the', 'a', 'an', 'is', 'are', 'was', 'were', 'be', 'been', 'being',
+    'have', 'has', 'had', 'do', 'does', 'did', 'will', 'would', 'could',
+    'should', 'may', 'might', 'must', 'shall', 'can', 'to', 'of', 'in',
+    'for', 'on', 'with', 'at', 'by', 'from', 'as', 'into', 'through',
+    'during', 'before', 'after', 'above', 'below', 'between', 'under',
+    'again', 'further', 'then', 'once', 'here', 'there', 'when', 'where',
+    'why', 'how', 'all', 'each', 'few', 'more', 'most', 'other', 'some',
+    'such', 'no', 'nor', 'not', 'only', 'own', 'same', 'so', 'than',
+    'too', 'very', 'just', 'and', 'but', 'if', 'or', 'because', 'until',
+    'while', 'this', 'that', 'these', 'those', 'i', 'me', 'my', 'myself',
+    'we', 'our', 'you', 'your', 'he', 'she', 'it', 'they', 'them', 'what',
+    'which', 'who', 'whom', 'its', 'his', 'her', 'their', 'our', 'up',
+    'out', 'about', 'any', 'also', 'get', 'got', 'like', 'one', 'two',
+    'know', 'even', 'new', 'want', 'way', 'people', 'time', 'year', 'think',
+    'amp', 'http', 'https', 'www', 'com', 'reddit', 'deleted', 'removed', 'nan'
+})
+
+class _TokenTable(dict):
+    """str.translate table: keeps a-z, lowercases A-Z, maps everything else to a space."""
+    def __missing__(self, codepoint):
+        self[codepoint] = ' '
+        return ' '
+
+_TOKEN_TRANS = _TokenTable(str.maketrans(
+    'ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz',
+    'abcdefghijklmnopqrstuvwxyzabcdefghijklmnopqrstuvwxyz'
+))
+
+def tokenize(text):
+    """Split text into lowercase a-z words."""
+    return text.translate(_TOKEN_TRANS).split()
+
 def analyze_sentiment(text):
     """
     Simple sentiment analysis.
@@ -34,30 +76,27 @@ def analyze_sentiment(text):
         return 0.0, 'neutral'
     
     # Clean and tokenize
-    words = re.findall(r'\b[a-z]+\b', text.lower())
+    words = tokenize(text)
     
     if not words:
         return 0.0, 'neutral'
     
-    positive_count = 0
-    negative_count = 0
+    weights = SENTIMENT_WEIGHTS
+    intensifiers = INTENSIFIER_SET
+    net = 0.0
+    total = 0.0
     intensifier_next = False
     
     for word in words:
-        multiplier = 1.5 if intensifier_next else 1.0
-        
-        if word in POSITIVE_WORDS:
-            positive_count += multiplier
-        elif word in NEGATIVE_WORDS:
-            negative_count += multiplier
-        
-        intensifier_next = word in INTENSIFIERS
+        weight = weights.get(word, 0.0) * (1.5 if intensifier_next else 1.0)
+        net += weight
+        total += abs(weight)
+        intensifier_next = word in intensifiers
     
-    total = positive_count + negative_count
     if total == 0:
         return 0.0, 'neutral'
     
-    score = (positive_count - negative_count) / len(words)
+    score = net / len(words)
     score = max(-1.0, min(1.0, score * 5))  # Normalize
     
     if score > 0.1:
@@ -69,8 +108,58 @@ def analyze_sentiment(text):
     
     return round(score, 3), label
 
+def score_texts(texts):
+    """
+    Vectorized analyze_sentiment over a Series of texts.
+    Returns: (scores, labels) Series aligned with the input index.
+    """
+    index = texts.index
+    texts = texts.fillna('').astype(str).reset_index(drop=True)
+    
+    tokens = texts.str.translate(_TOKEN_TRANS).str.split()
+    n_words = tokens.str.len()
+    words = tokens.explode()
+    
+    # 1.5x weight when the previous token of the same text is an intensifier
+    prev_intensifier = words.isin(INTENSIFIER_SET).groupby(level=0).shift(fill_value=False)
+    weights = words.map(SENTIMENT_WEIGHTS).fillna(0.0).astype(float) * np.where(prev_intensifier, 1.5, 1.0)
+    net = weights.groupby(level=0).sum()
+    total = weights.abs().groupby(level=0).sum()
+    
+    scores = (net / n_words.where(n_words > 0) * 5).clip(-1.0, 1.0)
+    scores = scores.where(total > 0, 0.0)
+    labels = np.select([scores > 0.1, scores < -0.1], ['positive', 'negative'], 'neutral')
+    
+    return (pd.Series(scores.round(3).to_numpy(), index=index),
+            pd.Series(labels, index=index))
+
+def analyze_posts_sentiment_df(df):
+    """
+    Score a posts DataFrame on title + selftext without touching the frame.
+    Returns: (scores, labels) Series aligned with df.index
+    """
+    text = df['title'].fillna('').astype(str) if 'title' in df else pd.Series('', index=df.index)
+    if 'selftext' in df:
+        text = text + ' ' + df['selftext'].fillna('').astype(str)
+    return score_texts(text)
+
+def sentiment_label_counts(labels):
+    """Count a labels Series into the {'positive', 'negative', 'neutral'} dict."""
+    label_counts = labels.value_counts()
+    return {label: int(label_counts.get(label, 0)) for label in ('positive', 'negative', 'neutral')}
+
 def analyze_posts_sentiment(posts):
-    """Analyze sentiment for a list of posts."""
+    """
+    Analyze sentiment for posts.
+    
+    Accepts a list of post dicts or a posts DataFrame; DataFrames are
+    scored in one vectorized pass and returned with sentiment columns added.
+    """
+    if isinstance(posts, pd.DataFrame):
+        df = posts.copy()
+        df['sentiment_score'], df['sentiment_label'] = analyze_posts_sentiment_df(df)
+        return df, sentiment_label_counts(df['sentiment_label'])
+    
     results = []
     sentiment_counts = {'positive': 0, 'negative': 0, 'neutral': 0}
     
@@ -100,32 +189,12 @@ def analyze_comments_sentiment(comments):
 
 def extract_keywords(texts, top_n=50):
     """Extract most common keywords from texts."""
-    # Stopwords
-    stopwords = {
-        'the', 'a', 'an', 'is', 'are', 'was', 'were', 'be', 'been', 'being',
-        'have', 'has', 'had', 'do', 'does', 'did', 'will', 'would', 'could',
-        'should', 'may', 'might', 'must', 'shall', 'can', 'to', 'of', 'in',
-        'for', 'on', 'with', 'at', 'by', 'from', 'as', 'into', 'through',
-        'during', 'before', 'after', 'above', 'below', 'between', 'under',
-        'again', 'further', 'then', 'once', 'here', 'there', 'when', 'where',
-        'why', 'how', 'all', 'each', 'few', 'more', 'most', 'other', 'some',
-        'such', 'no', 'nor', 'not', 'only', 'own', 'same', 'so', 'than',
-        'too', 'very', 'just', 'and', 'but', 'if', 'or', 'because', 'until',
-        'while', 'this', 'that', 'these', 'those', 'i', 'me', 'my', 'myself',
-        'we', 'our', 'you', 'your', 'he', 'she', 'it', 'they', 'them', 'what',
-        'which', 'who', 'whom', 'its', 'his', 'her', 'their', 'our', 'up',
-        'out', 'about', 'any', 'also', 'get', 'got', 'like', 'one', 'two',
-        'know', 'even', 'new', 'want', 'way', 'people', 'time', 'year', 'think',
-        'amp', 'http', 'https', 'www', 'com', 'reddit', 'deleted', 'removed', 'nan'
-    }
-    
-    all_words = []
+    counts = Counter()
     for text in texts:
         if text:
-            words = re.findall(r'\b[a-z]{3,}\b', text.lower())
-            all_words.extend([w for w in words if w not in stopwords])
+            counts.update(w for w in tokenize(text) if len(w) >= 3 and w not in STOPWORDS)
     
-    return Counter(all_words).most_common(top_n)
+    return counts.most_common(top_n)
 
 def generate_wordcloud_data(texts, top_n=100):
     """Generate word frequency data for word cloud visualization."""
@@ -141,46 +210,107 @@ def generate_wordcloud_data(texts, top_n=100):
         for word, count in keywords
     ]
 
+def _scalar(value):
+    """Plain Python number from a NumPy or Arrow scalar."""
+    return value.item() if hasattr(value, 'item') else value
+
+def _engagement_metrics_df(df):
+    """calculate_engagement_metrics for a posts DataFrame, using column ops."""
+    def column(name):
+        if name in df:
+            return pd.to_numeric(df[name], errors='coerce').fillna(0)
+        return pd.Series(0, index=df.index)
+    
+    score = column('score')
+    comments = column('num_comments')
+    total_posts = len(df)
+    total_score = _scalar(score.sum())
+    total_comments = _scalar(comments.sum())
+    engaged_count = int(((score > 0) | (comments > 0)).sum())
+    
+    ranked = df.assign(score=score, num_comments=comments)
+    ptypes = df['post_type'].fillna('unknown') if 'post_type' in df else pd.Series('unknown', index=df.index)
+    grouped = ranked.groupby(ptypes)[['score', 'num_comments']].agg(['count', 'sum'])
+    type_performance = {}
+    for ptype, row in grouped.iterrows():
+        count = int(row[('score', 'count')])
+        type_performance[ptype] = {
+            'count': count,
+            'total_score': _scalar(row[('score', 'sum')]),
+            'total_comments': _scalar(row[('num_comments', 'sum')]),
+        }
+        type_performance[ptype]['avg_score'] = type_performance[ptype]['total_score'] / count
+        type_performance[ptype]['avg_comments'] = type_performance[ptype]['total_comments'] / count
+    
+    return {
+        'total_posts': total_posts,
+        'total_score': total_score,
+        'total_comments': total_comments,
+        'total_awards': _scalar(column('total_awards').sum()),
+        'avg_score': total_score / total_posts,
+        'avg_comments': total_comments / total_posts,
+        'engagement_rate': engaged_count / total_posts,
+        'top_by_score': df.loc[ranked.nlargest(10, 'score').index].to_dict('records'),
+        'top_by_comments': df.loc[ranked.nlargest(10, 'num_comments').index].to_dict('records'),
+        'type_performance': type_performance
+    }
+
 def calculate_engagement_metrics(posts):
-    """Calculate engagement metrics for posts."""
+    """
+    Calculate engagement metrics for posts.
+    
+    Accepts a list of post dicts or a posts DataFrame. The list path is a
+    single pass with heap-based top-10 selection.
+    """
+    if isinstance(posts, pd.DataFrame):
+        return _engagement_metrics_df(posts) if len(posts) else {}
+    
     if not posts:
         return {}
     
     total_posts = len(posts)
-    total_score = sum(p.get('score', 0) for p in posts)
-    total_comments = sum(p.get('num_comments', 0) for p in posts)
-    total_awards = sum(p.get('total_awards', 0) for p in posts)
-    
-    # Posts with engagement
-    engaged_posts = [p for p in posts if p.get('score', 0) > 0 or p.get('num_comments', 0) > 0]
-    
-    # Top performers
-    top_by_score = sorted(posts, key=lambda x: x.get('score', 0), reverse=True)[:10]
-    top_by_comments = sorted(posts, key=lambda x: x.get('num_comments', 0), reverse=True)[:10]
-    
-    # Post type performance
+    total_score = 0
+    total_comments = 0
+    total_awards = 0
+    engaged_count = 0
     type_performance = {}
+    
     for post in posts:
+        score = post.get('score', 0)
+        num_comments = post.get('num_comments', 0)
+        total_score += score
+        total_comments += num_comments
+        total_awards += post.get('total_awards', 0)
+        
+        # Posts with engagement
+        if score > 0 or num_comments > 0:
+            engaged_count += 1
+        
+        # Post type performance
         ptype = post.get('post_type', 'unknown')
-        if ptype not in type_performance:
-            type_performance[ptype] = {'count': 0, 'total_score': 0, 'total_comments': 0}
-        type_performance[ptype]['count'] += 1
-        type_performance[ptype]['total_score'] += post.get('score', 0)
-        type_performance[ptype]['total_comments'] += post.get('num_comments', 0)
-    
-    for ptype in type_performance:
-        count = type_performance[ptype]['count']
-        type_performance[ptype]['avg_score'] = type_performance[ptype]['total_score'] / count
-        type_performance[ptype]['avg_comments'] = type_performance[ptype]['total_comments'] / count
+        stats = type_performance.get(ptype)
+        if stats is None:
+            stats = type_performance[ptype] = {'count': 0, 'total_score': 0, 'total_comments': 0}
+        stats['count'] += 1
+        stats['total_score'] += score
+        stats['total_comments'] += num_comments
+    
+    for stats in type_performance.values():
+        stats['avg_score'] = stats['total_score'] / stats['count']
+        stats['avg_comments'] = stats['total_comments'] / stats['count']
+    
+    # Top performers (heap selection instead of full sorts)
+    top_by_score = heapq.nlargest(10, posts, key=lambda x: x.get('score', 0))
+    top_by_comments = heapq.nlargest(10, posts, key=lambda x: x.get('num_comments', 0))
     
     return {
         'total_posts': total_posts,
         'total_score': total_score,
         'total_comments': total_comments,
         'total_awards': total_awards,
-        'avg_score': total_score / total_posts if total_posts else 0,
-        'avg_comments': total_comments / total_posts if total_posts else 0,
-        'engagement_rate': len(engaged_posts) / total_posts if total_posts else 0,
+        'avg_score': total_score / total_posts,
+        'avg_comments': total_comments / total_posts,
+        'engagement_rate': engaged_count / total_posts,
         'top_by_score': top_by_score,
         'top_by_comments': top_by_comments,
         'type_performance': type_performance
@@ -193,13 +323,15 @@ def find_best_posting_times(posts):
     
     for post in posts:
         created = post.get('created_utc', '')
-        if not created:
+        if not created or pd.isna(created):
             continue
         
         try:
-            # Parse ISO format
-            from datetime import datetime
-            dt = datetime.fromisoformat(created.replace('Z', '+00:00'))
+            # Already-parsed timestamps (e.g. from the dashboard) or ISO strings
+            if isinstance(created, datetime):
+                dt = created
+            else:
+                dt = datetime.fromisoformat(created.replace('Z', '+00:00'))
             hour = dt.hour
             day = dt.strftime('%A')
             
@@ -225,8 +357,8 @@ def find_best_posting_times(posts):
         daily_stats[day]['avg_score'] = daily_stats[day]['total_score'] / daily_stats[day]['count']
     
     # Find best times
-    best_hours = sorted(hourly_stats.items(), key=lambda x: x[1]['avg_score'], reverse=True)[:5]
-    best_days = sorted(daily_stats.items(), key=lambda x: x[1]['avg_score'], reverse=True)[:3]
+    best_hours = heapq.nlargest(5, hourly_stats.items(), key=lambda x: x[1]['avg_score'])
+    best_days = heapq.nlargest(3, daily_stats.items(), key=lambda x: x[1]['avg_score'])
     
     return {
         'hourly_stats': hourly_stats,
@@ -234,3 +366,37 @@ def find_best_posting_times(posts):
         'best_hours': [(h, s['avg_score']) for h, s in best_hours],
         'best_days': [(d, s['avg_score']) for d, s in best_days]
     }
+
+def find_best_posting_times_df(df):
+    """
+    find_best_posting_times for a posts DataFrame.
+    
+    Timestamps are parsed once into datetime64 and grouped by hour and
+    weekday in a single groupby each; returns the same structure.
+    """
+    empty = {'hourly_stats': {}, 'daily_stats': {}, 'best_hours': [], 'best_days': []}
+    if 'created_utc' not in df or len(df) == 0:
+        return empty
+    
+    created = pd.to_datetime(df['created_utc'], errors='coerce', utc=True, cache=True)
+    score = pd.to_numeric(df['score'], errors='coerce').fillna(0) if 'score' in df else pd.Series(0, index=df.index)
+    valid = created.notna()
+    created, score = created[valid], score[valid]
+    
+    def stats_by(keys):
+        grouped = score.groupby(keys).agg(['count', 'sum', 'mean'])
+        stats = {
+            key: {'count': int(row['count']), 'total_score': _scalar(row['sum']), 'avg_score': float(row['mean'])}
+            for key, row in grouped.iterrows()
+        }
+        return grouped, stats
+    
+    hourly, hourly_stats = stats_by(created.dt.hour.astype(int).to_numpy())
+    daily, daily_stats = stats_by(created.dt.day_name().to_numpy())
+    
+    return {
+        'hourly_stats': {int(h): s for h, s in hourly_stats.items()},
+        'daily_stats': daily_stats,
+        'best_hours': [(int(h), float(avg)) for h, avg in hourly['mean'].nlargest(5).items()],
+        'best_days': [(d, float(avg)) for d, avg in daily['mean'].nlargest(3).items()]
+    }
@@ -15,7 +15,7 @@ from pathlib import Path
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
 from export.database import (
-    get_connection, search_posts, search_comments,
+    get_read_connection, fetch_dicts, iso_created, search_posts, search_comments,
     get_subreddit_stats, get_all_subreddits,
     get_job_history, get_job_stats, get_database_info
 )
@@ -97,15 +97,14 @@ def list_posts(
 @app.get("/posts/{post_id}", tags=["Posts"])
 def get_post(post_id: str):
     """Get a single post by ID."""
-    conn = get_connection()
+    conn = get_read_connection()
     cursor = conn.cursor()
     cursor.execute("SELECT * FROM posts WHERE id = ?", (post_id,))
     row = cursor.fetchone()
-    conn.close()
     
     if not row:
         raise HTTPException(status_code=404, detail="Post not found")
-    return dict(row)
+    return iso_created([dict(row)])[0]
 
 
 # --- COMMENTS ---
@@ -186,11 +185,10 @@ def raw_query(
         sql = f"{sql} LIMIT {limit}"
     
     try:
-        conn = get_connection()
+        conn = get_read_connection()
         cursor = conn.cursor()
         cursor.execute(sql)
-        results = [dict(row) for row in cursor.fetchall()]
-        conn.close()
+        results = fetch_dicts(cursor)
         return {"query": sql, "count": len(results), "results": results}
     except Exception as e:
         raise HTTPException(status_code=400, detail=f"Query error: {e}")
@@ -214,17 +212,16 @@ def grafana_query(body: dict):
     for target in body.get('targets', []):
         subreddit = target.get('target')
         if subreddit:
-            conn = get_connection()
+            conn = get_read_connection()
             cursor = conn.cursor()
             cursor.execute("""
-                SELECT date(created_utc) as time, COUNT(*) as value
+                SELECT date(created_utc, 'unixepoch', 'localtime') as time, COUNT(*) as value
                 FROM posts WHERE subreddit = ?
-                GROUP BY date(created_utc)
+                GROUP BY time
                 ORDER BY time
             """, (subreddit,))
             
             datapoints = [[row['value'], row['time']] for row in cursor.fetchall()]
-            conn.close()
             
             results.append({
                 "target": subreddit,
@@ -16,10 +16,11 @@ import signal
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
 from analytics.sentiment import (
-    analyze_posts_sentiment, extract_keywords, 
-    calculate_engagement_metrics, find_best_posting_times
+    analyze_posts_sentiment_df, sentiment_label_counts, extract_keywords, 
+    calculate_engagement_metrics, find_best_posting_times_df
 )
 from search.query import search_all_data, advanced_search, get_top_posts
+from export.parquet import read_posts
 
 # Page config
 st.set_page_config(
@@ -58,20 +59,66 @@ st.markdown("""
 </style>
 """, unsafe_allow_html=True)
 
-def load_subreddit_data(subreddit_path):
-    """Load all data for a subreddit."""
+# Columns the dashboard tabs actually render; exports re-read the full CSV
+POSTS_COLS = ['id', 'title', 'score', 'num_comments', 'post_type', 'author',
+              'created_utc', 'has_media', 'selftext', 'permalink']
+COMMENTS_COLS = ['body', 'score', 'author', 'created_utc']
+
+def _read_csv(path, columns):
+    """Read only the wanted columns that exist in a CSV, via PyArrow."""
+    header = pd.read_csv(path, nrows=0).columns
+    usecols = [c for c in columns if c in header]
+    return pd.read_csv(path, engine='pyarrow', usecols=usecols, dtype_backend='pyarrow')
+
+def _mtime(path):
+    """File modification time, used to invalidate cached reads (0 if missing)."""
+    return path.stat().st_mtime if path.exists() else 0
+
+@st.cache_data(show_spinner=False)
+def _read_subreddit_data(subreddit_dir, posts_mtime, comments_mtime):
+    """Read a subreddit's CSVs; the mtimes only key the cache."""
+    subreddit_path = Path(subreddit_dir)
     data = {}
     
     posts_file = subreddit_path / 'posts.csv'
     if posts_file.exists():
-        data['posts'] = pd.read_csv(posts_file)
+        # posts.parquet is typed (created_utc is already a timestamp)
+        data['posts'] = read_posts(subreddit_path, POSTS_COLS)
     
     comments_file = subreddit_path / 'comments.csv'
     if comments_file.exists():
-        data['comments'] = pd.read_csv(comments_file)
+        data['comments'] = _read_csv(comments_file, COMMENTS_COLS)
     
     return data
 
+def load_subreddit_data(subreddit_path):
+    """Load all data for a subreddit (cached until its CSVs change)."""
+    return _read_subreddit_data(
+        str(subreddit_path),
+        _mtime(subreddit_path / 'posts.csv'),
+        _mtime(subreddit_path / 'comments.csv')
+    )
+
+def _load_cached_posts(subreddit_dir, posts_mtime):
+    """Posts DataFrame from the load cache."""
+    comments_mtime = _mtime(Path(subreddit_dir) / 'comments.csv')
+    return _read_subreddit_data(subreddit_dir, posts_mtime, comments_mtime).get('posts', pd.DataFrame())
+
+@st.cache_data(show_spinner=False)
+def _cached_keywords(subreddit_dir, posts_mtime, top_n):
+    """Top keywords over titles and selftext, recomputed only when posts.csv changes."""
+    posts_df = _load_cached_posts(subreddit_dir, posts_mtime)
+    texts = posts_df['title'].dropna().tolist() if 'title' in posts_df else []
+    if 'selftext' in posts_df:
+        texts.extend(posts_df['selftext'].dropna().tolist())
+    return extract_keywords(texts, top_n=top_n)
+
+@st.cache_data(show_spinner=False)
+def _cached_posting_times(subreddit_dir, posts_mtime):
+    """Best posting times, recomputed only when posts.csv changes."""
+    posts_df = _load_cached_posts(subreddit_dir, posts_mtime)
+    return find_best_posting_times_df(posts_df)
+
 def get_available_data():
     """Get list of scraped subreddits and users."""
     data_dir = Path(__file__).parent.parent / 'data'
@@ -213,7 +260,7 @@ def main():
             with col2:
                 st.subheader("📅 Posts Over Time")
                 if 'created_utc' in posts_df:
-                    posts_df['date'] = pd.to_datetime(posts_df['created_utc']).dt.date
+                    posts_df['date'] = posts_df['created_utc'].dt.date
                     daily = posts_df.groupby('date').size()
                     st.line_chart(daily)
             
@@ -233,8 +280,8 @@ def main():
             
             if st.button("Run Sentiment Analysis"):
                 with st.spinner("Analyzing sentiment..."):
-                    posts_list = posts_df.to_dict('records')
-                    analyzed_posts, sentiment_counts = analyze_posts_sentiment(posts_list)
+                    scores, labels = analyze_posts_sentiment_df(posts_df)
+                    sentiment_counts = sentiment_label_counts(labels)
                     
                     col1, col2, col3 = st.columns(3)
                     col1.metric("Positive", sentiment_counts['positive'], delta=None)
@@ -252,11 +299,7 @@ def main():
             
             # Keywords
             st.subheader("☁️ Top Keywords")
-            texts = posts_df['title'].tolist()
-            if 'selftext' in posts_df:
-                texts.extend(posts_df['selftext'].dropna().tolist())
-            
-            keywords = extract_keywords(texts, top_n=30)
+            keywords = _cached_keywords(str(sub_path), _mtime(sub_path / 'posts.csv'), 30)
             
             if keywords:
                 kw_df = pd.DataFrame(keywords, columns=['Word', 'Count'])
@@ -268,7 +311,7 @@ def main():
             st.subheader("⏰ Best Posting Times")
             
             if 'created_utc' in posts_df:
-                timing_data = find_best_posting_times(posts_df.to_dict('records'))
+                timing_data = _cached_posting_times(str(sub_path), _mtime(sub_path / 'posts.csv'))
                 
                 if timing_data['best_hours']:
                     st.write("**Best Hours to Post:**")
@@ -312,9 +355,12 @@ def main():
                 filtered = posts_df.copy()
                 
                 if search_query:
-                    mask = filtered['title'].str.contains(search_query, case=False, na=False)
+                    # One literal scan over title + selftext; the unit separator
+                    # keeps a phrase from matching across the two fields
+                    haystack = filtered['title'].fillna('').astype(str)
                     if 'selftext' in filtered:
-                        mask |= filtered['selftext'].str.contains(search_query, case=False, na=False)
+                        haystack = haystack + '\x1f' + filtered['selftext'].fillna('').astype(str)
+                    mask = haystack.str.contains(search_query, case=False, regex=False, na=False)
                     filtered = filtered[mask]
                 
                 if min_score > 0:
@@ -579,6 +625,11 @@ def main():
             export_format = st.selectbox("Format", ['CSV', 'JSON', 'Excel'])
             
             if st.button("📥 Download Posts"):
+                # The loaded frame only has the dashboard columns; export everything
+                posts_file = sub_path / 'posts.csv'
+                if posts_file.exists():
+                    posts_df = pd.read_csv(posts_file)
+                
                 if export_format == 'CSV':
                     csv = posts_df.to_csv(index=False)
                     st.download_button(
@@ -2,6 +2,13 @@
 Database module - SQLite storage for scraped data
 """
 import sqlite3
+import threading
+import atexit
+import logging
+import queue
+import time
+from concurrent.futures import Future
+from contextlib import contextmanager
 from pathlib import Path
 from datetime import datetime
 import json
@@ -9,67 +16,440 @@ import sys
 sys.path.insert(0, str(Path(__file__).parent.parent))
 from config import DB_PATH, DATA_DIR
 
-def get_connection():
-    """Get database connection."""
+# Applied to every new connection. journal_mode persists in the file; the
+# rest are per-connection. WAL + synchronous=NORMAL turns each commit into an
+# append to the WAL instead of an fsync, and lets readers run during writes.
+CONNECTION_PRAGMAS = (
+    # Only takes effect while the file is still empty, so it has to come
+    # before journal_mode writes the header. Post rows with selftext often
+    # exceed 1 KB; 32 KB pages keep the B-trees shallow.
+    "PRAGMA page_size=32768",
+    "PRAGMA journal_mode=WAL",
+    "PRAGMA synchronous=NORMAL",
+    # Truncate the WAL back to 64 MB after checkpoints instead of leaving
+    # it at its high-water mark after a large scrape
+    "PRAGMA journal_size_limit=67108864",
+    "PRAGMA temp_store=MEMORY",
+    "PRAGMA mmap_size=134217728",
+    "PRAGMA cache_size=-20000",
+    "PRAGMA busy_timeout=5000",
+    # INSERT OR REPLACE must fire the delete triggers that keep FTS in sync
+    "PRAGMA recursive_triggers=ON",
+)
+
+# Write connections auto-checkpoint once the WAL reaches about this many
+# bytes. wal_autocheckpoint counts pages, so _connect converts it using the
+# file's actual page_size (databases created before 32 KB pages keep 4 KB).
+# The writer thread also truncates the WAL every CHECKPOINT_SECONDS.
+WAL_AUTOCHECKPOINT_BYTES = 40 * 1024 * 1024
+
+# page_size/journal_mode/synchronous are write-side settings; skip them on read-only connections
+READ_PRAGMAS = tuple(p for p in CONNECTION_PRAGMAS
+                     if not p.startswith(("PRAGMA page_size", "PRAGMA journal_mode", "PRAGMA synchronous")))
+
+# Bump when the schema changes; stored in the file as PRAGMA user_version
+SCHEMA_VERSION = 7
+
+logger = logging.getLogger(__name__)
+
+# Set by init_database() once the FTS5 tables exist; LIKE is used otherwise
+FTS_ENABLED = False
+
+# One long-lived connection per thread instead of open/close per call
+_local = threading.local()
+_connections = []
+_connections_lock = threading.Lock()
+
+# The schema is checked once per process, on the first connection
+_schema_checked = False
+_schema_lock = threading.Lock()
+
+def _connect():
     DATA_DIR.mkdir(exist_ok=True)
-    conn = sqlite3.connect(DB_PATH)
+    # check_same_thread=False only so close_connections() can run at exit
+    # Larger statement cache: search_* builds one SQL string per filter combination
+    # isolation_level=None: no implicit BEGINs; multi-statement writes open
+    # their own transaction (init_database, batch_writes, save_*_batch)
+    conn = sqlite3.connect(DB_PATH, check_same_thread=False, cached_statements=256,
+                           isolation_level=None)
     conn.row_factory = sqlite3.Row
+    for pragma in CONNECTION_PRAGMAS:
+        conn.execute(pragma)
+    page_size = conn.execute("PRAGMA page_size").fetchone()[0]
+    conn.execute(f"PRAGMA wal_autocheckpoint={max(1, WAL_AUTOCHECKPOINT_BYTES // page_size)}")
     return conn
 
-def init_database():
-    """Initialize database tables."""
-    conn = get_connection()
-    cursor = conn.cursor()
+def get_connection():
+    """Get this thread's database connection (opened on first use, then reused)."""
+    conn = getattr(_local, 'conn', None)
+    if conn is not None:
+        try:
+            conn.total_changes  # raises once the connection has been closed
+            return conn
+        except sqlite3.ProgrammingError:
+            pass
+    
+    conn = _connect()
+    _local.conn = conn
+    with _connections_lock:
+        _connections.append(conn)
+    
+    _ensure_schema(conn)
+    return conn
+
+def get_read_connection():
+    """
+    Get this thread's read-only connection.
+    
+    Used by the search_*/get_* readers so they never take a write lock;
+    writes go through the writer thread (see _submit).
+    """
+    conn = getattr(_local, 'read_conn', None)
+    if conn is not None:
+        try:
+            conn.total_changes
+            return conn
+        except sqlite3.ProgrammingError:
+            pass
+    
+    get_connection()  # creates/upgrades the schema on first use
+    conn = sqlite3.connect(f"file:{Path(DB_PATH).resolve().as_posix()}?mode=ro", uri=True,
+                           check_same_thread=False, cached_statements=256, isolation_level=None)
+    conn.row_factory = sqlite3.Row
+    for pragma in READ_PRAGMAS:
+        conn.execute(pragma)
+    _local.read_conn = conn
+    with _connections_lock:
+        _connections.append(conn)
+    return conn
+
+def _ensure_schema(conn):
+    global _schema_checked
+    if _schema_checked:
+        return
+    with _schema_lock:
+        if not _schema_checked:
+            init_database(conn)
+            _schema_checked = True
+
+def close_connections():
+    """Close every connection handed out by get_connection()/get_read_connection()."""
+    with _connections_lock:
+        for conn in _connections:
+            try:
+                conn.close()
+            except sqlite3.Error:
+                pass
+        _connections.clear()
+
+atexit.register(close_connections)
+
+def fetch_dicts(cursor):
+    """
+    Remaining rows of an executed cursor as dicts.
+    
+    Skips the per-row sqlite3.Row: rows come back as plain tuples and are
+    zipped against column names looked up once.
+    """
+    cursor.row_factory = None
+    cols = [column[0] for column in cursor.description]
+    return [dict(zip(cols, row)) for row in cursor.fetchall()]
+
+# --- WRITER THREAD ---
+
+# The writer drains up to this many queued writes into one transaction
+WRITE_BUFFER_SIZE = 200
+
+# How often the writer runs wal_checkpoint(TRUNCATE)
+CHECKPOINT_SECONDS = 60
+
+_write_q = queue.Queue()
+_writer = None
+_writer_lock = threading.Lock()
+
+def _submit(sql, rows):
+    """
+    Queue executemany(sql, rows) for the writer thread.
+    
+    Returns a Future resolving to the statement's rowcount (or its error)
+    once the transaction holding it has committed. Inside batch_writes()
+    the statement runs right away on that block's connection instead (the
+    writer would only wait on its lock), and commits with the block.
+    """
+    conn = getattr(_local, 'batch_conn', None)
+    if conn is not None:
+        return _write_inline(conn, sql, rows)
+    
+    global _writer
+    with _writer_lock:
+        if _writer is None or not _writer.is_alive():
+            get_connection()  # schema first, on the caller's thread
+            _writer = threading.Thread(target=_writer_loop, name="db-writer", daemon=True)
+            _writer.start()
+    
+    future = Future()
+    _write_q.put((sql, rows, future))
+    return future
+
+def _write_inline(conn, sql, rows):
+    """executemany on an open batch_writes() transaction, isolated like _write_batch."""
+    future = Future()
+    conn.execute("SAVEPOINT write")
+    try:
+        future.set_result(conn.executemany(sql, rows).rowcount)
+    except Exception as e:
+        conn.execute("ROLLBACK TO write")
+        future.set_exception(e)
+    conn.execute("RELEASE write")
+    return future
+
+def _writer_loop():
+    conn = _connect()
+    last_checkpoint = time.monotonic()
+    try:
+        while True:
+            if time.monotonic() - last_checkpoint >= CHECKPOINT_SECONDS:
+                _checkpoint(conn)
+                last_checkpoint = time.monotonic()
+            
+            try:
+                item = _write_q.get(timeout=CHECKPOINT_SECONDS)
+            except queue.Empty:
+                continue
+            if item is None:
+                return
+            
+            # Group commit: whatever queued up during the last commit goes
+            # into this one, without waiting for more
+            batch = [item]
+            while len(batch) < WRITE_BUFFER_SIZE:
+                try:
+                    item = _write_q.get_nowait()
+                except queue.Empty:
+                    break
+                if item is None:
+                    _write_batch(conn, batch)
+                    return
+                batch.append(item)
+            
+            _write_batch(conn, batch)
+    finally:
+        try:
+            # Refresh planner stats for whatever this process changed
+            conn.execute("PRAGMA optimize")
+        except sqlite3.Error as e:
+            logger.warning("PRAGMA optimize failed: %s", e)
+        conn.close()
+
+def _checkpoint(conn):
+    """Fold the WAL back into the database file and truncate it."""
+    try:
+        busy, _, _ = conn.execute("PRAGMA wal_checkpoint(TRUNCATE)").fetchone()
+        if busy:
+            logger.debug("WAL checkpoint blocked by readers; retrying next round")
+    except sqlite3.Error as e:
+        logger.warning("WAL checkpoint failed: %s", e)
+
+def _write_batch(conn, batch):
+    """One transaction for the batch; a savepoint per write keeps failures isolated."""
+    results = []
+    try:
+        conn.execute("BEGIN IMMEDIATE")
+        for sql, rows, future in batch:
+            conn.execute("SAVEPOINT write")
+            try:
+                results.append((future, conn.executemany(sql, rows).rowcount, None))
+            except Exception as e:
+                conn.execute("ROLLBACK TO write")
+                results.append((future, None, e))
+            conn.execute("RELEASE write")
+        conn.commit()
+    except Exception as e:
+        if conn.in_transaction:
+            conn.rollback()
+        for _, _, future in batch:
+            future.set_exception(e)
+        return
+    
+    for future, rowcount, error in results:
+        if error is None:
+            future.set_result(rowcount)
+        else:
+            future.set_exception(error)
+
+def _stop_writer():
+    if _writer is not None and _writer.is_alive():
+        _write_q.put(None)
+        _writer.join()
+
+# Registered after close_connections, so it runs first at exit
+atexit.register(_stop_writer)
+
+def init_database(conn=None):
+    """
+    Create or upgrade the database schema.
+    
+    Cheap when the file is already at SCHEMA_VERSION: one PRAGMA read.
+    Otherwise the DDL runs under BEGIN IMMEDIATE, so concurrent starters
+    serialize and only the first one does the work. get_connection()
+    calls this once per process.
+    """
+    global FTS_ENABLED
+    conn = conn or get_connection()
+    
+    if conn.execute("PRAGMA user_version").fetchone()[0] < SCHEMA_VERSION:
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            # Re-check under the write lock; another process may have finished first
+            version = conn.execute("PRAGMA user_version").fetchone()[0]
+            if version < SCHEMA_VERSION:
+                cursor = conn.cursor()
+                _migrate(cursor, version)
+                _create_schema(cursor)
+                # Fresh planner stats for the indexes just created
+                cursor.execute("ANALYZE")
+                conn.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+                print("✅ Database initialized")
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+    
+    FTS_ENABLED = conn.execute(
+        "SELECT 1 FROM sqlite_master WHERE name = 'posts_fts'"
+    ).fetchone() is not None
+
+# STRICT tables need SQLite 3.37+; older builds get the same table without it
+_STRICT = ", STRICT" if sqlite3.sqlite_version_info >= (3, 37, 0) else ""
+
+# created_utc is stored as Unix epoch seconds (see _to_epoch)
+_POSTS_TABLE = """
+    CREATE TABLE IF NOT EXISTS {name} (
+        id TEXT PRIMARY KEY,
+        subreddit TEXT,
+        title TEXT,
+        author TEXT,
+        created_utc INTEGER,
+        permalink TEXT,
+        url TEXT,
+        score INTEGER DEFAULT 0,
+        upvote_ratio REAL DEFAULT 0,
+        num_comments INTEGER DEFAULT 0,
+        num_crossposts INTEGER DEFAULT 0,
+        selftext TEXT,
+        post_type TEXT,
+        is_nsfw BOOLEAN DEFAULT 0,
+        is_spoiler BOOLEAN DEFAULT 0,
+        flair TEXT,
+        total_awards INTEGER DEFAULT 0,
+        has_media BOOLEAN DEFAULT 0,
+        media_downloaded BOOLEAN DEFAULT 0,
+        source TEXT,
+        scraped_at TEXT DEFAULT CURRENT_TIMESTAMP,
+        sentiment_score REAL,
+        sentiment_label TEXT
+    )"""
+
+# Keyed directly by the Reddit comment id: one B-tree instead of a rowid
+# table plus a UNIQUE index on comment_id
+_COMMENTS_TABLE = """
+    CREATE TABLE IF NOT EXISTS {name} (
+        comment_id TEXT PRIMARY KEY,
+        post_id TEXT,
+        post_permalink TEXT,
+        parent_id TEXT,
+        author TEXT,
+        body TEXT,
+        score INTEGER DEFAULT 0,
+        created_utc INTEGER,
+        depth INTEGER DEFAULT 0,
+        is_submitter INTEGER DEFAULT 0,
+        scraped_at TEXT DEFAULT CURRENT_TIMESTAMP,
+        sentiment_score REAL,
+        sentiment_label TEXT
+    ) WITHOUT ROWID""" + _STRICT
+
+def _rebuild_table(cursor, table, create_sql, columns, where=""):
+    """
+    Recreate `table` from create_sql (a template with a {name} field),
+    copying `columns` across. Indexes and triggers on the old table are
+    dropped with it; _create_schema() puts them back.
     
+    created_utc goes through to_epoch() on the way, since the new tables
+    store it as INTEGER.
+    """
+    cols = ", ".join(columns)
+    select = ", ".join("to_epoch(created_utc)" if c == 'created_utc' else c for c in columns)
+    cursor.execute(f"DROP TABLE IF EXISTS {table}_new")
+    cursor.execute(create_sql.format(name=f"{table}_new"))
+    cursor.execute(f"INSERT OR IGNORE INTO {table}_new ({cols}) SELECT {select} FROM {table} {where}")
+    cursor.execute(f"DROP TABLE {table}")
+    cursor.execute(f"ALTER TABLE {table}_new RENAME TO {table}")
+
+def _table_columns(cursor, table):
+    return [row[1] for row in cursor.execute(f"PRAGMA table_info({table})")]
+
+def _column_type(cursor, table, column):
+    for row in cursor.execute(f"PRAGMA table_info({table})"):
+        if row[1] == column:
+            return row[2].upper()
+    return None
+
+def _migrate(cursor, version):
+    """
+    Upgrade an existing schema from `version`.
+    
+    Only changes CREATE ... IF NOT EXISTS cannot express live here;
+    _create_schema() runs afterwards and adds anything new.
+    """
+    cursor.connection.create_function("to_epoch", 1, _to_epoch)
+    
+    if version < 2:
+        # Prefixes of idx_posts_sub_created / idx_comments_post_score
+        cursor.execute("DROP INDEX IF EXISTS idx_posts_subreddit")
+        cursor.execute("DROP INDEX IF EXISTS idx_comments_post")
+    
+    if version < 3 and 'id' in _table_columns(cursor, 'comments'):
+        # comments becomes WITHOUT ROWID, so its FTS index can no longer be
+        # external-content on rowid; drop it and let _init_fts() rebuild it
+        for trigger in ('insert', 'delete', 'update'):
+            cursor.execute(f"DROP TRIGGER IF EXISTS comments_fts_{trigger}")
+        cursor.execute("DROP TABLE IF EXISTS comments_fts")
+        columns = [c for c in _table_columns(cursor, 'comments') if c != 'id']
+        _rebuild_table(cursor, 'comments', _COMMENTS_TABLE, columns, "WHERE comment_id IS NOT NULL")
+    
+    if version < 4:
+        # Prefix of idx_posts_score_created
+        cursor.execute("DROP INDEX IF EXISTS idx_posts_score")
+    
+    if version < 5:
+        # created_utc TEXT (ISO strings) -> INTEGER epoch. Posts keep their
+        # rowids so the external-content posts_fts index stays valid.
+        if _column_type(cursor, 'posts', 'created_utc') == 'TEXT':
+            _rebuild_table(cursor, 'posts', _POSTS_TABLE, ['rowid'] + _table_columns(cursor, 'posts'))
+        if _column_type(cursor, 'comments', 'created_utc') == 'TEXT':
+            _rebuild_table(cursor, 'comments', _COMMENTS_TABLE, _table_columns(cursor, 'comments'))
+    
+    if version < 6:
+        # Replaced by idx_posts_created_desc
+        cursor.execute("DROP INDEX IF EXISTS idx_posts_created")
+    
+    if version < 7:
+        # permalink UNIQUE was a second B-tree per post insert (posts are
+        # deduplicated by id), and comments' FOREIGN KEY was never enforced
+        # (foreign_keys is off). Both need a table rebuild to drop.
+        if any(index[3] == 'u' for index in cursor.execute("PRAGMA index_list(posts)").fetchall()):
+            _rebuild_table(cursor, 'posts', _POSTS_TABLE, ['rowid'] + _table_columns(cursor, 'posts'))
+        if cursor.execute("PRAGMA foreign_key_list(comments)").fetchall():
+            _rebuild_table(cursor, 'comments', _COMMENTS_TABLE, _table_columns(cursor, 'comments'))
+
+def _create_schema(cursor):
+    """Run the schema DDL (inside the caller's transaction)."""
     # Posts table
-    cursor.execute("""
-        CREATE TABLE IF NOT EXISTS posts (
-            id TEXT PRIMARY KEY,
-            subreddit TEXT,
-            title TEXT,
-            author TEXT,
-            created_utc TEXT,
-            permalink TEXT UNIQUE,
-            url TEXT,
-            score INTEGER DEFAULT 0,
-            upvote_ratio REAL DEFAULT 0,
-            num_comments INTEGER DEFAULT 0,
-            num_crossposts INTEGER DEFAULT 0,
-            selftext TEXT,
-            post_type TEXT,
-            is_nsfw BOOLEAN DEFAULT 0,
-            is_spoiler BOOLEAN DEFAULT 0,
-            flair TEXT,
-            total_awards INTEGER DEFAULT 0,
-            has_media BOOLEAN DEFAULT 0,
-            media_downloaded BOOLEAN DEFAULT 0,
-            source TEXT,
-            scraped_at TEXT DEFAULT CURRENT_TIMESTAMP,
-            sentiment_score REAL,
-            sentiment_label TEXT
-        )
-    """)
+    cursor.execute(_POSTS_TABLE.format(name="posts"))
     
     # Comments table
-    cursor.execute("""
-        CREATE TABLE IF NOT EXISTS comments (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            comment_id TEXT UNIQUE,
-            post_id TEXT,
-            post_permalink TEXT,
-            parent_id TEXT,
-            author TEXT,
-            body TEXT,
-            score INTEGER DEFAULT 0,
-            created_utc TEXT,
-            depth INTEGER DEFAULT 0,
-            is_submitter BOOLEAN DEFAULT 0,
-            scraped_at TEXT DEFAULT CURRENT_TIMESTAMP,
-            sentiment_score REAL,
-            sentiment_label TEXT,
-            FOREIGN KEY (post_id) REFERENCES posts(id)
-        )
-    """)
+    cursor.execute(_COMMENTS_TABLE.format(name="comments"))
     
     # Subreddits table (for tracking)
     cursor.execute("""
@@ -134,147 +514,419 @@ def init_database():
     """)
     
     # Create indexes
-    cursor.execute("CREATE INDEX IF NOT EXISTS idx_posts_subreddit ON posts(subreddit)")
-    cursor.execute("CREATE INDEX IF NOT EXISTS idx_posts_created ON posts(created_utc)")
-    cursor.execute("CREATE INDEX IF NOT EXISTS idx_posts_score ON posts(score)")
-    cursor.execute("CREATE INDEX IF NOT EXISTS idx_comments_post ON comments(post_id)")
+    # Composite indexes let "WHERE subreddit/post_id = ? ORDER BY ... LIMIT"
+    # walk the index in order and stop early instead of sorting
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_posts_sub_created ON posts(subreddit, created_utc DESC)")
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_posts_created_desc ON posts(created_utc DESC)")
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_posts_author_created ON posts(author, created_utc DESC)")
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_posts_score_created ON posts(score DESC, created_utc DESC)")
+    # Partial and covering for the top-authors query in get_subreddit_stats()
+    cursor.execute("""
+        CREATE INDEX IF NOT EXISTS idx_posts_top_authors ON posts(subreddit, author, score)
+        WHERE author != '[deleted]'
+    """)
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_comments_post_score ON comments(post_id, score DESC)")
     cursor.execute("CREATE INDEX IF NOT EXISTS idx_comments_author ON comments(author)")
     
-    conn.commit()
-    conn.close()
-    print("✅ Database initialized")
+    _init_fts(cursor)
 
-def save_post(post_data, subreddit):
-    """Save a single post to database."""
-    conn = get_connection()
-    cursor = conn.cursor()
+def _to_epoch(value):
+    """
+    Unix timestamp (int) for a created_utc value.
     
+    Accepts Reddit's float epochs, numeric strings, datetimes and ISO
+    strings; naive ISO strings are local time, as written by the scrapers'
+    datetime.fromtimestamp(). Unparseable values become NULL.
+    """
+    if value is None or value == '':
+        return None
+    if isinstance(value, datetime):
+        return int(value.timestamp())
+    if isinstance(value, (int, float)):
+        return int(value)
     try:
+        return int(float(value))
+    except ValueError:
+        pass
+    try:
+        return int(datetime.fromisoformat(value.replace('Z', '+00:00')).timestamp())
+    except ValueError:
+        return None
+
+def iso_created(rows):
+    """
+    Turn the created_utc epochs of fetched row dicts back into the local-time
+    ISO strings posts and comments were written with, so API and search
+    callers see the same values as before created_utc became INTEGER.
+    """
+    for row in rows:
+        value = row.get('created_utc')
+        if value is not None:
+            row['created_utc'] = datetime.fromtimestamp(value).isoformat()
+    return rows
+
+# Write statements are module constants so every call passes the same SQL
+# string and hits the connection's prepared-statement cache
+_POST_COLUMNS = (
+    "id", "subreddit", "title", "author", "created_utc", "permalink", "url", "score",
+    "upvote_ratio", "num_comments", "num_crossposts", "selftext", "post_type",
+    "is_nsfw", "is_spoiler", "flair", "total_awards", "has_media", "media_downloaded", "source",
+)
+_COMMENT_COLUMNS = (
+    "comment_id", "post_id", "post_permalink", "parent_id", "author", "body",
+    "score", "created_utc", "depth", "is_submitter",
+)
+
+# Defaults for keys a scraped dict may lack (anything not listed: NULL)
+_POST_DEFAULTS = {
+    'score': 0, 'upvote_ratio': 0, 'num_comments': 0, 'num_crossposts': 0,
+    'selftext': '', 'is_nsfw': False, 'is_spoiler': False, 'flair': '',
+    'total_awards': 0, 'has_media': False, 'media_downloaded': False, 'source': '',
+}
+_COMMENT_DEFAULTS = {'score': 0, 'depth': 0, 'is_submitter': False}
+
+_POST_FIELDS = tuple((key, _POST_DEFAULTS.get(key)) for key in _POST_COLUMNS)
+_COMMENT_FIELDS = tuple((key, _COMMENT_DEFAULTS.get(key)) for key in _COMMENT_COLUMNS)
+_POST_CREATED = _POST_COLUMNS.index('created_utc')
+_COMMENT_CREATED = _COMMENT_COLUMNS.index('created_utc')
+
+# Bind bools through a registered adapter instead of the generic adaptation
+# lookup sqlite3 tries for every non-int parameter
+sqlite3.register_adapter(bool, int)
+
+def _post_row(post, subreddit):
+    """Parameter list for the posts INSERT statements (_POST_COLUMNS order)."""
+    get = post.get
+    row = [get(key, default) for key, default in _POST_FIELDS]
+    row[1] = subreddit
+    row[_POST_CREATED] = _to_epoch(row[_POST_CREATED])
+    return row
+
+def _comment_row(comment, post_id):
+    """Parameter list for the comments INSERT statement (_COMMENT_COLUMNS order)."""
+    get = comment.get
+    row = [get(key, default) for key, default in _COMMENT_FIELDS]
+    row[1] = post_id
+    row[_COMMENT_CREATED] = _to_epoch(row[_COMMENT_CREATED])
+    return row
+
+def _insert_sql(table, columns, verb="INSERT"):
+    return "{} INTO {} ({}) VALUES ({})".format(
+        verb, table, ", ".join(columns), ", ".join("?" * len(columns)))
+
+INSERT_POST_SQL = _insert_sql("posts", _POST_COLUMNS, "INSERT OR IGNORE")
+INSERT_COMMENT_SQL = _insert_sql("comments", _COMMENT_COLUMNS, "INSERT OR IGNORE")
+
+# Upsert in place: keeps the rowid, scraped_at and sentiment columns,
+# and only re-indexes FTS when title/selftext actually change
+UPSERT_POST_SQL = _insert_sql("posts", _POST_COLUMNS) + (
+    " ON CONFLICT(id) DO UPDATE SET "
+    + ", ".join(f"{col} = excluded.{col}" for col in _POST_COLUMNS[1:])
+)
+
+_FTS_TRIGGERS = (
+    """
+    CREATE TRIGGER IF NOT EXISTS posts_fts_insert AFTER INSERT ON posts BEGIN
+        INSERT INTO posts_fts(rowid, title, selftext) VALUES (new.rowid, new.title, new.selftext);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS posts_fts_delete AFTER DELETE ON posts BEGIN
+        INSERT INTO posts_fts(posts_fts, rowid, title, selftext) VALUES ('delete', old.rowid, old.title, old.selftext);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS posts_fts_update AFTER UPDATE OF title, selftext ON posts BEGIN
+        INSERT INTO posts_fts(posts_fts, rowid, title, selftext) VALUES ('delete', old.rowid, old.title, old.selftext);
+        INSERT INTO posts_fts(rowid, title, selftext) VALUES (new.rowid, new.title, new.selftext);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS comments_fts_insert AFTER INSERT ON comments BEGIN
+        INSERT INTO comments_fts(comment_id, body) VALUES (new.comment_id, new.body);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS comments_fts_delete AFTER DELETE ON comments BEGIN
+        DELETE FROM comments_fts WHERE comment_id = old.comment_id;
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS comments_fts_update AFTER UPDATE OF comment_id, body ON comments BEGIN
+        UPDATE comments_fts SET comment_id = new.comment_id, body = new.body WHERE comment_id = old.comment_id;
+    END
+    """,
+)
+
+def _init_fts(cursor):
+    """
+    Create FTS5 indexes over posts(title, selftext) and comments(body).
+    
+    Both are kept in sync by triggers and populated from existing rows the
+    first time they are created. posts_fts is external-content on the posts
+    rowid; comments_fts holds its own copy keyed by comment_id.
+    """
+    existing = {row[0] for row in cursor.execute(
+        "SELECT name FROM sqlite_master WHERE name IN ('posts_fts', 'comments_fts')"
+    )}
+    
+    try:
+        cursor.execute("""
+            CREATE VIRTUAL TABLE IF NOT EXISTS posts_fts USING fts5(
+                title, selftext, content='posts', content_rowid='rowid',
+                tokenize='porter unicode61'
+            )
+        """)
+        # comments has no rowid to point at, so this index stores its own copy
         cursor.execute("""
-            INSERT OR REPLACE INTO posts 
-            (id, subreddit, title, author, created_utc, permalink, url, score, 
-             upvote_ratio, num_comments, num_crossposts, selftext, post_type,
-             is_nsfw, is_spoiler, flair, total_awards, has_media, media_downloaded, source)
-            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-        """, (
-            post_data.get('id'),
-            subreddit,
-            post_data.get('title'),
-            post_data.get('author'),
-            post_data.get('created_utc'),
-            post_data.get('permalink'),
-            post_data.get('url'),
-            post_data.get('score', 0),
-            post_data.get('upvote_ratio', 0),
-            post_data.get('num_comments', 0),
-            post_data.get('num_crossposts', 0),
-            post_data.get('selftext', ''),
-            post_data.get('post_type'),
-            post_data.get('is_nsfw', False),
-            post_data.get('is_spoiler', False),
-            post_data.get('flair', ''),
-            post_data.get('total_awards', 0),
-            post_data.get('has_media', False),
-            post_data.get('media_downloaded', False),
-            post_data.get('source', '')
-        ))
+            CREATE VIRTUAL TABLE IF NOT EXISTS comments_fts USING fts5(
+                comment_id UNINDEXED, body,
+                tokenize='porter unicode61'
+            )
+        """)
+    except sqlite3.OperationalError as e:
+        # SQLite built without FTS5
+        print(f"⚠️ Full-text search unavailable: {e}")
+        return
+    
+    # Executed one by one: executescript() would commit the open transaction
+    for trigger in _FTS_TRIGGERS:
+        cursor.execute(trigger)
+    
+    # Index rows that were stored before the FTS tables existed
+    if 'posts_fts' not in existing:
+        cursor.execute("INSERT INTO posts_fts(posts_fts) VALUES ('rebuild')")
+    if 'comments_fts' not in existing:
+        cursor.execute("INSERT INTO comments_fts(comment_id, body) SELECT comment_id, body FROM comments")
+
+def fts_query(query):
+    """
+    Turn free text into a safe FTS5 MATCH expression.
+    
+    Each word becomes a quoted prefix term, so FTS5 operators and syntax
+    characters in user input are matched literally; terms are ANDed.
+    """
+    terms = query.split()
+    return " ".join('"{}"*'.format(term.replace('"', '""')) for term in terms)
+
+@contextmanager
+def batch_writes():
+    """
+    Run many saves in one transaction, so a whole scrape costs one commit.
+    
+    Usage:
+        with batch_writes() as conn:
+            for page in pages:
+                save_posts_batch(page, subreddit, conn=conn)
+    
+    The block holds the database write lock on this thread's connection, so
+    writes this thread makes through the writer thread (save_post,
+    save_*_batch without conn, the job records) run inline on that
+    connection instead and commit or roll back with the block. Writes from
+    other threads wait for it to finish.
+    """
+    conn = get_connection()
+    conn.execute("BEGIN IMMEDIATE")
+    _local.batch_conn = conn
+    try:
+        yield conn
         conn.commit()
+    except BaseException:
+        conn.rollback()
+        raise
+    finally:
+        _local.batch_conn = None
+
+def save_post(post_data, subreddit):
+    """Save a single post to database."""
+    try:
+        _submit(UPSERT_POST_SQL, [_post_row(post_data, subreddit)]).result()
         return True
-    except Exception as e:
-        print(f"DB Error: {e}")
+    except sqlite3.IntegrityError as e:
+        # Constraint violation on this row only; the writer already rolled it back
+        logger.warning("Post %s not saved: %s", post_data.get('id'), e)
         return False
-    finally:
-        conn.close()
+    except sqlite3.Error as e:
+        # Locked, disk full, corrupt...: the caller has to know
+        logger.error("Saving post %s failed: %s", post_data.get('id'), e)
+        raise
 
-def save_posts_batch(posts, subreddit):
-    """Save multiple posts efficiently."""
-    conn = get_connection()
-    cursor = conn.cursor()
-    saved = 0
-    
-    for post in posts:
-        try:
-            cursor.execute("""
-                INSERT OR IGNORE INTO posts 
-                (id, subreddit, title, author, created_utc, permalink, url, score, 
-                 upvote_ratio, num_comments, num_crossposts, selftext, post_type,
-                 is_nsfw, is_spoiler, flair, total_awards, has_media, media_downloaded, source)
-                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-            """, (
-                post.get('id'),
-                subreddit,
-                post.get('title'),
-                post.get('author'),
-                post.get('created_utc'),
-                post.get('permalink'),
-                post.get('url'),
-                post.get('score', 0),
-                post.get('upvote_ratio', 0),
-                post.get('num_comments', 0),
-                post.get('num_crossposts', 0),
-                post.get('selftext', ''),
-                post.get('post_type'),
-                post.get('is_nsfw', False),
-                post.get('is_spoiler', False),
-                post.get('flair', ''),
-                post.get('total_awards', 0),
-                post.get('has_media', False),
-                post.get('media_downloaded', False),
-                post.get('source', '')
-            ))
-            if cursor.rowcount > 0:
-                saved += 1
-        except:
-            continue
+def save_posts_batch(posts, subreddit, conn=None, staging=False):
+    """Save multiple posts efficiently (one prepared statement).
+    
+    Goes through the writer thread and returns once committed, unless
+    called inside batch_writes(). Errors are logged and re-raised; with
+    batch_writes() that rolls back the batch. With staging=True the rows go
+    to the in-memory staging database and reach disk on the next
+    flush_staging().
+    """
+    # Rows are built as executemany consumes them, never held as a list
+    rows = (_post_row(post, subreddit) for post in posts)
+    if staging:
+        return _stage(INSERT_POST_SQL, rows)
     
-    conn.commit()
-    conn.close()
-    return saved
+    try:
+        if conn is None:
+            # Rows skipped by OR IGNORE are not counted
+            return _submit(INSERT_POST_SQL, rows).result()
+        # Inside batch_writes(): the caller owns the transaction
+        return conn.executemany(INSERT_POST_SQL, rows).rowcount
+    except Exception as e:
+        logger.error("Saving posts for r/%s failed: %s", subreddit, e)
+        raise
 
-def save_comments_batch(comments, post_id):
-    """Save multiple comments efficiently."""
-    conn = get_connection()
-    cursor = conn.cursor()
-    saved = 0
+def save_comments_batch(comments, post_id, conn=None, staging=False):
+    """Save multiple comments efficiently (one prepared statement).
+    
+    Goes through the writer thread and returns once committed, unless
+    called inside batch_writes(). Errors are logged and re-raised; with
+    batch_writes() that rolls back the batch. With staging=True the rows go
+    to the in-memory staging database and reach disk on the next
+    flush_staging().
+    """
+    # Rows are built as executemany consumes them, never held as a list
+    rows = (_comment_row(comment, post_id) for comment in comments)
+    if staging:
+        return _stage(INSERT_COMMENT_SQL, rows)
     
-    for comment in comments:
+    try:
+        if conn is None:
+            return _submit(INSERT_COMMENT_SQL, rows).result()
+        # Inside batch_writes(): the caller owns the transaction
+        return conn.executemany(INSERT_COMMENT_SQL, rows).rowcount
+    except Exception as e:
+        logger.error("Saving comments for post %s failed: %s", post_id, e)
+        raise
+
+# --- STAGING FOR BURSTY SCRAPES ---
+
+# Staged rows are moved to disk once this many are pending, or every
+# STAGING_FLUSH_SECONDS by a background thread, whichever comes first
+STAGING_FLUSH_ROWS = 5000
+STAGING_FLUSH_SECONDS = 5.0
+
+_staging = None
+_staged_rows = 0
+_staging_lock = threading.Lock()
+_staging_stop = threading.Event()
+
+def _staging_connection():
+    """In-memory copy of the posts/comments tables."""
+    global _staging
+    if _staging is None:
+        conn = sqlite3.connect(":memory:", check_same_thread=False, isolation_level=None)
+        conn.execute(_POSTS_TABLE.format(name="posts"))
+        conn.execute(_COMMENTS_TABLE.format(name="comments"))
+        _staging = conn
+        threading.Thread(target=_flush_periodically, name="db-staging-flush", daemon=True).start()
+    return _staging
+
+def _stage(sql, rows):
+    global _staged_rows
+    with _staging_lock:
+        conn = _staging_connection()
+        cursor = conn.cursor()
+        conn.execute("BEGIN")
         try:
-            cursor.execute("""
-                INSERT OR IGNORE INTO comments 
-                (comment_id, post_id, post_permalink, parent_id, author, body, 
-                 score, created_utc, depth, is_submitter)
-                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-            """, (
-                comment.get('comment_id'),
-                post_id,
-                comment.get('post_permalink'),
-                comment.get('parent_id'),
-                comment.get('author'),
-                comment.get('body'),
-                comment.get('score', 0),
-                comment.get('created_utc'),
-                comment.get('depth', 0),
-                comment.get('is_submitter', False)
-            ))
-            if cursor.rowcount > 0:
-                saved += 1
-        except:
-            continue
+            cursor.executemany(sql, rows)
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+        _staged_rows += cursor.rowcount
+        full = _staged_rows >= STAGING_FLUSH_ROWS
+    
+    if full:
+        flush_staging()
+    return cursor.rowcount
+
+def flush_staging():
+    """
+    Move staged posts/comments to the disk database.
     
-    conn.commit()
-    conn.close()
-    return saved
+    The staged rows go to disk through the writer thread like any other
+    write (so there is still only one writer), and readers of the disk file
+    only ever wait on one INSERT per table instead of on every scraped
+    page. Rows stay staged until the writer has committed them.
+    
+    Returns:
+        Number of posts written to disk
+    """
+    global _staged_rows
+    with _staging_lock:
+        if _staging is None or not _staged_rows:
+            return 0
+        conn = _staging
+        post_cols = ", ".join(_POST_COLUMNS)
+        comment_cols = ", ".join(_COMMENT_COLUMNS)
+        
+        posts = conn.execute(f"SELECT {post_cols} FROM posts").fetchall()
+        comments = conn.execute(f"SELECT {comment_cols} FROM comments").fetchall()
+        # Queued back to back, so usually committed in the same transaction
+        posts_written = _submit(INSERT_POST_SQL, posts)
+        comments_written = _submit(INSERT_COMMENT_SQL, comments)
+        posts_written = posts_written.result()
+        comments_written.result()
+        
+        conn.execute("DELETE FROM posts")
+        conn.execute("DELETE FROM comments")
+        _staged_rows = 0
+        return posts_written
+
+def _flush_periodically():
+    while not _staging_stop.wait(STAGING_FLUSH_SECONDS):
+        try:
+            flush_staging()
+        except sqlite3.Error as e:
+            logger.error("Flushing staged rows failed: %s", e)
+
+def _close_staging():
+    global _staging
+    _staging_stop.set()
+    if _staging is not None:
+        try:
+            flush_staging()
+        finally:
+            _staging.close()
+            _staging = None
+
+# Registered after close_connections, so it runs first at exit
+atexit.register(_close_staging)
 
 def search_posts(query=None, subreddit=None, author=None, min_score=None, 
                  start_date=None, end_date=None, post_type=None, limit=100):
-    """Search posts with filters."""
-    conn = get_connection()
+    """
+    Search posts with filters.
+    
+    start_date/end_date take anything _to_epoch understands (epoch
+    seconds, datetimes, ISO strings); anything else raises ValueError
+    rather than silently matching no rows.
+    """
+    bounds = {}
+    for name, value in (('start_date', start_date), ('end_date', end_date)):
+        if value:
+            bounds[name] = _to_epoch(value)
+            if bounds[name] is None:
+                raise ValueError(f"Invalid {name}: {value!r}")
+    
+    conn = get_read_connection()
     cursor = conn.cursor()
     
-    sql = "SELECT * FROM posts WHERE 1=1"
+    # Pin the index for filters the planner tends to misjudge as range scans;
+    # FTS and subreddit lookups are left to the planner
+    index = ""
+    if author and not query:
+        index = " INDEXED BY idx_posts_author_created"
+    elif min_score and not (query or subreddit or author):
+        index = " INDEXED BY idx_posts_score_created"
+    
+    sql = f"SELECT * FROM posts{index} WHERE 1=1"
     params = []
     
-    if query:
+    if query and FTS_ENABLED:
+        sql += " AND rowid IN (SELECT rowid FROM posts_fts WHERE posts_fts MATCH ?)"
+        params.append(fts_query(query))
+    elif query:
         sql += " AND (title LIKE ? OR selftext LIKE ?)"
         params.extend([f"%{query}%", f"%{query}%"])
     
@@ -292,11 +944,11 @@ def search_posts(query=None, subreddit=None, author=None, min_score=None,
     
     if start_date:
         sql += " AND created_utc >= ?"
-        params.append(start_date)
+        params.append(bounds['start_date'])
     
     if end_date:
         sql += " AND created_utc <= ?"
-        params.append(end_date)
+        params.append(bounds['end_date'])
     
     if post_type:
         sql += " AND post_type = ?"
@@ -306,19 +958,20 @@ def search_posts(query=None, subreddit=None, author=None, min_score=None,
     params.append(limit)
     
     cursor.execute(sql, params)
-    results = [dict(row) for row in cursor.fetchall()]
-    conn.close()
-    return results
+    return iso_created(fetch_dicts(cursor))
 
 def search_comments(query=None, post_id=None, author=None, min_score=None, limit=100):
     """Search comments with filters."""
-    conn = get_connection()
+    conn = get_read_connection()
     cursor = conn.cursor()
     
     sql = "SELECT * FROM comments WHERE 1=1"
     params = []
     
-    if query:
+    if query and FTS_ENABLED:
+        sql += " AND comment_id IN (SELECT comment_id FROM comments_fts WHERE comments_fts MATCH ?)"
+        params.append(fts_query(query))
+    elif query:
         sql += " AND body LIKE ?"
         params.append(f"%{query}%")
     
@@ -338,73 +991,64 @@ def search_comments(query=None, post_id=None, author=None, min_score=None, limit
     params.append(limit)
     
     cursor.execute(sql, params)
-    results = [dict(row) for row in cursor.fetchall()]
-    conn.close()
-    return results
+    return iso_created(fetch_dicts(cursor))
 
 def get_subreddit_stats(subreddit):
     """Get statistics for a subreddit."""
-    conn = get_connection()
+    conn = get_read_connection()
     cursor = conn.cursor()
     
-    stats = {}
-    
-    # Post stats
+    # One statement: the CTE is read several times, so SQLite materializes it
+    # and the subreddit's rows are scanned once; top authors come straight off
+    # the covering idx_posts_top_authors. Breakdowns come back as JSON
+    # arrays of [key, value] pairs so NULL keys survive.
     cursor.execute("""
-        SELECT 
-            COUNT(*) as total_posts,
-            AVG(score) as avg_score,
-            MAX(score) as max_score,
-            SUM(num_comments) as total_comments,
-            AVG(upvote_ratio) as avg_upvote_ratio
-        FROM posts WHERE subreddit = ?
-    """, (subreddit,))
-    row = cursor.fetchone()
-    if row:
-        stats.update(dict(row))
-    
-    # Post type distribution
-    cursor.execute("""
-        SELECT post_type, COUNT(*) as count 
-        FROM posts WHERE subreddit = ? 
-        GROUP BY post_type
-    """, (subreddit,))
-    stats['post_types'] = {row['post_type']: row['count'] for row in cursor.fetchall()}
-    
-    # Top authors
-    cursor.execute("""
-        SELECT author, COUNT(*) as post_count, SUM(score) as total_score
-        FROM posts WHERE subreddit = ? AND author != '[deleted]'
-        GROUP BY author ORDER BY post_count DESC LIMIT 10
+        WITH s AS (
+            SELECT post_type, score, num_comments, upvote_ratio, created_utc
+            FROM posts WHERE subreddit = ?1
+        )
+        SELECT
+            (SELECT COUNT(*) FROM s) as total_posts,
+            (SELECT AVG(score) FROM s) as avg_score,
+            (SELECT MAX(score) FROM s) as max_score,
+            (SELECT SUM(num_comments) FROM s) as total_comments,
+            (SELECT AVG(upvote_ratio) FROM s) as avg_upvote_ratio,
+            (SELECT json_group_array(json_array(post_type, count)) FROM (
+                SELECT post_type, COUNT(*) as count FROM s GROUP BY post_type
+            )) as post_types,
+            (SELECT json_group_array(json_object('author', author, 'post_count', post_count, 'total_score', total_score)) FROM (
+                SELECT author, COUNT(*) as post_count, SUM(score) as total_score
+                FROM posts WHERE subreddit = ?1 AND author != '[deleted]'
+                GROUP BY author ORDER BY post_count DESC LIMIT 10
+            )) as top_authors,
+            (SELECT json_group_array(json_array(hour, count)) FROM (
+                SELECT strftime('%H', created_utc, 'unixepoch', 'localtime') as hour, COUNT(*) as count
+                FROM s GROUP BY hour ORDER BY hour
+            )) as hourly_activity
     """, (subreddit,))
-    stats['top_authors'] = [dict(row) for row in cursor.fetchall()]
+    row = dict(cursor.fetchone())
     
-    # Activity by hour
-    cursor.execute("""
-        SELECT strftime('%H', created_utc) as hour, COUNT(*) as count
-        FROM posts WHERE subreddit = ?
-        GROUP BY hour ORDER BY hour
-    """, (subreddit,))
-    stats['hourly_activity'] = {row['hour']: row['count'] for row in cursor.fetchall()}
+    stats = {key: row[key] for key in ('total_posts', 'avg_score', 'max_score',
+                                       'total_comments', 'avg_upvote_ratio')}
+    stats['post_types'] = {post_type: count for post_type, count in json.loads(row['post_types'])}
+    stats['top_authors'] = json.loads(row['top_authors'])
+    stats['hourly_activity'] = {hour: count for hour, count in json.loads(row['hourly_activity'])}
     
-    conn.close()
     return stats
 
 def get_all_subreddits():
     """Get list of all scraped subreddits."""
-    conn = get_connection()
+    conn = get_read_connection()
     cursor = conn.cursor()
     
     cursor.execute("""
         SELECT subreddit, COUNT(*) as post_count, 
-               MAX(created_utc) as latest_post,
-               MIN(created_utc) as oldest_post
+               strftime('%Y-%m-%dT%H:%M:%S', MAX(created_utc), 'unixepoch', 'localtime') as latest_post,
+               strftime('%Y-%m-%dT%H:%M:%S', MIN(created_utc), 'unixepoch', 'localtime') as oldest_post
         FROM posts GROUP BY subreddit ORDER BY post_count DESC
     """)
     
-    results = [dict(row) for row in cursor.fetchall()]
-    conn.close()
-    return results
+    return fetch_dicts(cursor)
 
 # --- JOB HISTORY FUNCTIONS ---
 
@@ -417,19 +1061,13 @@ def start_job_record(target, mode, is_user=False, dry_run=False):
     """
     import uuid
     
-    conn = get_connection()
-    cursor = conn.cursor()
-    
     job_id = str(uuid.uuid4())[:8]
     started_at = datetime.now().isoformat()
     
-    cursor.execute("""
+    _submit("""
         INSERT INTO job_history (job_id, target, is_user, mode, status, started_at, dry_run)
         VALUES (?, ?, ?, ?, 'running', ?, ?)
-    """, (job_id, target, is_user, mode, started_at, dry_run))
-    
-    conn.commit()
-    conn.close()
+    """, [(job_id, target, is_user, mode, started_at, dry_run)]).result()
     
     print(f"📋 Job started: {job_id}")
     return job_id
@@ -446,7 +1084,7 @@ def complete_job_record(job_id, status, posts=0, comments=0, media=0, errors=Non
         media: Number of media files downloaded
         errors: Error message if failed
     """
-    conn = get_connection()
+    conn = get_read_connection()
     cursor = conn.cursor()
     
     completed_at = datetime.now().isoformat()
@@ -464,16 +1102,13 @@ def complete_job_record(job_id, status, posts=0, comments=0, media=0, errors=Non
     if errors:
         error_count = 1
     
-    cursor.execute("""
+    _submit("""
         UPDATE job_history 
         SET status = ?, completed_at = ?, duration_seconds = ?,
             posts_scraped = ?, comments_scraped = ?, media_downloaded = ?,
             errors = ?, error_count = ?
         WHERE job_id = ?
-    """, (status, completed_at, duration, posts, comments, media, errors, error_count, job_id))
-    
-    conn.commit()
-    conn.close()
+    """, [(status, completed_at, duration, posts, comments, media, errors, error_count, job_id)]).result()
     
     if status == 'completed':
         print(f"✅ Job {job_id} completed: {posts} posts, {comments} comments in {duration:.1f}s")
@@ -482,7 +1117,7 @@ def complete_job_record(job_id, status, posts=0, comments=0, media=0, errors=Non
 
 def get_job_history(limit=50, target=None, status=None):
     """Get recent job history."""
-    conn = get_connection()
+    conn = get_read_connection()
     cursor = conn.cursor()
     
     sql = "SELECT * FROM job_history WHERE 1=1"
@@ -500,13 +1135,11 @@ def get_job_history(limit=50, target=None, status=None):
     params.append(limit)
     
     cursor.execute(sql, params)
-    results = [dict(row) for row in cursor.fetchall()]
-    conn.close()
-    return results
+    return fetch_dicts(cursor)
 
 def get_job_stats():
     """Get aggregated job statistics."""
-    conn = get_connection()
+    conn = get_read_connection()
     cursor = conn.cursor()
     
     stats = {}
@@ -532,9 +1165,8 @@ def get_job_stats():
         SELECT target, status, duration_seconds, posts_scraped, started_at
         FROM job_history ORDER BY started_at DESC LIMIT 10
     """)
-    stats['recent_jobs'] = [dict(row) for row in cursor.fetchall()]
+    stats['recent_jobs'] = fetch_dicts(cursor)
     
-    conn.close()
     return stats
 
 def print_job_history(limit=20):
@@ -567,23 +1199,17 @@ def print_job_history(limit=20):
 def enable_auto_vacuum():
     """Enable incremental auto-vacuum on SQLite database."""
     conn = get_connection()
-    try:
-        conn.execute("PRAGMA auto_vacuum = INCREMENTAL")
-        conn.execute("PRAGMA incremental_vacuum")
-        conn.commit()
-        print("✅ Auto-vacuum enabled")
-    finally:
-        conn.close()
+    conn.execute("PRAGMA auto_vacuum = INCREMENTAL")
+    conn.execute("PRAGMA incremental_vacuum")
+    conn.commit()
+    print("✅ Auto-vacuum enabled")
 
 def vacuum_database():
     """Run VACUUM to optimize and compact the database."""
     conn = get_connection()
-    try:
-        print("🔧 Running VACUUM...")
-        conn.execute("VACUUM")
-        print("✅ Database optimized")
-    finally:
-        conn.close()
+    print("🔧 Running VACUUM...")
+    conn.execute("VACUUM")
+    print("✅ Database optimized")
 
 def backup_database(backup_path=None):
     """
@@ -595,8 +1221,6 @@ def backup_database(backup_path=None):
     Returns:
         Path to the backup file
     """
-    import shutil
-    
     backup_dir = DATA_DIR / "backups"
     backup_dir.mkdir(exist_ok=True)
     
@@ -604,7 +1228,18 @@ def backup_database(backup_path=None):
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
         backup_path = backup_dir / f"reddit_scraper_{timestamp}.db"
     
-    shutil.copy2(DB_PATH, backup_path)
+    # Staged rows belong in the backup too
+    flush_staging()
+    
+    # The online backup API reads through the WAL; copying the main file
+    # would miss every commit not yet checkpointed into it
+    source = sqlite3.connect(DB_PATH)
+    target = sqlite3.connect(str(backup_path))
+    try:
+        source.backup(target)
+    finally:
+        target.close()
+        source.close()
     
     # Get file size
     size_mb = Path(backup_path).stat().st_size / (1024 * 1024)
@@ -620,7 +1255,7 @@ def get_database_info():
     if DB_PATH.exists():
         info['size_mb'] = DB_PATH.stat().st_size / (1024 * 1024)
     
-    conn = get_connection()
+    conn = get_read_connection()
     cursor = conn.cursor()
     
     # Table counts
@@ -631,12 +1266,7 @@ def get_database_info():
         try:
             cursor.execute(f"SELECT COUNT(*) FROM {table}")
             info['tables'][table] = cursor.fetchone()[0]
-        except:
+        except sqlite3.OperationalError:
             info['tables'][table] = 0
     
-    conn.close()
     return info
-
-# Initialize on import
-init_database()
-
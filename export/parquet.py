@@ -2,10 +2,138 @@
 Parquet Export Module - For DuckDB/Warehouse integration
 Export scraped data to Parquet format for analytics tools.
 """
+import os
+import numpy as np
 import pandas as pd
 from pathlib import Path
 from datetime import datetime
 
+# Rows per posts.parquet row group; read_post_rows decodes only the groups
+# holding the rows it is asked for
+POSTS_ROW_GROUP = 10000
+
+# Kept in posts.parquet's schema metadata; a file without this version is
+# rebuilt even when it is newer than posts.csv
+POSTS_PARQUET_VERSION = b"2"
+
+def _typed_posts(df):
+    """Convert posts read from CSV to typed columns."""
+    # Convert datetime columns
+    if 'created_utc' in df.columns:
+        # Scraped rows are naive, RSS/monitor rows carry +00:00; read both
+        # (naive as UTC) the way search's _created_ns does
+        df['created_utc'] = pd.to_datetime(df['created_utc'], errors='coerce', format='ISO8601', utc=True)
+    
+    # Optimize dtypes
+    for col in ['score', 'num_comments', 'num_crossposts', 'total_awards']:
+        if col in df.columns:
+            df[col] = pd.to_numeric(df[col], errors='coerce').fillna(0).astype('int32')
+    
+    for col in ['is_nsfw', 'is_spoiler', 'has_media', 'media_downloaded']:
+        if col in df.columns:
+            df[col] = df[col].astype(bool)
+    
+    return df
+
+def sync_posts_parquet(data_dir):
+    """
+    Write posts.parquet next to posts.csv when it is missing or older than the CSV.
+    
+    Args:
+        data_dir: Scrape folder (e.g. data/r_python)
+    
+    Returns:
+        Path to posts.parquet, or None if there is no posts.csv
+    """
+    data_dir = Path(data_dir)
+    posts_csv = data_dir / "posts.csv"
+    posts_parquet = data_dir / "posts.parquet"
+    
+    if not posts_csv.exists():
+        return None
+    
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+    
+    if posts_parquet.exists() and posts_parquet.stat().st_mtime >= posts_csv.stat().st_mtime:
+        metadata = pq.read_schema(posts_parquet).metadata or {}
+        if metadata.get(b"posts_format") == POSTS_PARQUET_VERSION:
+            return posts_parquet
+    
+    table = pa.Table.from_pandas(_typed_posts(pd.read_csv(posts_csv)), preserve_index=False)
+    table = table.replace_schema_metadata(
+        {**(table.schema.metadata or {}), b"posts_format": POSTS_PARQUET_VERSION})
+    
+    # Write then rename so readers never see a half-written file
+    tmp_file = posts_parquet.with_suffix(".parquet.tmp")
+    pq.write_table(table, tmp_file, compression="zstd", row_group_size=POSTS_ROW_GROUP)
+    os.replace(tmp_file, posts_parquet)
+    
+    return posts_parquet
+
+def read_posts(data_dir, columns=None, filters=None):
+    """
+    Read a scrape folder's posts, preferring the posts.parquet sibling.
+    
+    The Parquet file is (re)built from posts.csv first if it is stale.
+    Unknown entries in columns are ignored. filters are pyarrow
+    (column, op, value) predicates applied during the scan; a predicate on
+    a column the file lacks matches no rows.
+    
+    Returns:
+        DataFrame with Arrow-backed dtypes (empty if there is no data)
+    """
+    import pyarrow.parquet as pq
+    
+    posts_parquet = sync_posts_parquet(data_dir)
+    if posts_parquet is None:
+        return pd.DataFrame()
+    
+    if columns is not None or filters:
+        schema = pq.read_schema(posts_parquet)
+        available = set(schema.names)
+        if columns is not None:
+            columns = [c for c in columns if c in available]
+        if filters and any(f[0] not in available for f in filters):
+            # Nothing can match a missing column; keep the columns, no rows
+            empty = schema.empty_table().to_pandas(types_mapper=pd.ArrowDtype)
+            return empty if columns is None else empty[columns]
+    
+    return pd.read_parquet(posts_parquet, engine="pyarrow", columns=columns,
+                           filters=filters, dtype_backend="pyarrow")
+
+def read_post_rows(data_dir, rows):
+    """
+    Complete posts at the given row positions of a folder's posts.parquet,
+    in the order given. Only the row groups holding those rows are decoded.
+    
+    Returns:
+        DataFrame with Arrow-backed dtypes, like read_posts
+    """
+    import pyarrow.parquet as pq
+    
+    posts_parquet = sync_posts_parquet(data_dir)
+    if posts_parquet is None:
+        return pd.DataFrame()
+    
+    parquet_file = pq.ParquetFile(posts_parquet)
+    rows = np.asarray(rows, dtype=np.int64)
+    if len(rows) == 0:
+        return parquet_file.schema_arrow.empty_table().to_pandas(types_mapper=pd.ArrowDtype)
+    
+    # Row group of each row, and where that group starts in the file and
+    # in the table of just the groups read
+    sizes = np.array([parquet_file.metadata.row_group(i).num_rows
+                      for i in range(parquet_file.num_row_groups)], dtype=np.int64)
+    starts = np.concatenate(([0], np.cumsum(sizes)[:-1]))
+    groups = np.searchsorted(starts, rows, side='right') - 1
+    needed = np.unique(groups)
+    offsets = np.zeros(len(sizes), dtype=np.int64)
+    offsets[needed] = np.concatenate(([0], np.cumsum(sizes[needed])[:-1]))
+    
+    table = parquet_file.read_row_groups(needed.tolist())
+    return table.take(rows - starts[groups] + offsets[groups]).to_pandas(types_mapper=pd.ArrowDtype)
+
 def export_to_parquet(subreddit, output_dir=None, prefix="r"):
     """
     Export subreddit data to Parquet format.
@@ -39,20 +167,7 @@ def export_to_parquet(subreddit, output_dir=None, prefix="r"):
     posts_csv = data_dir / "posts.csv"
     if posts_csv.exists():
         print(f"📦 Converting posts to Parquet...")
-        df = pd.read_csv(posts_csv)
-        
-        # Convert datetime columns
-        if 'created_utc' in df.columns:
-            df['created_utc'] = pd.to_datetime(df['created_utc'], errors='coerce')
-        
-        # Optimize dtypes
-        for col in ['score', 'num_comments', 'num_crossposts', 'total_awards']:
-            if col in df.columns:
-                df[col] = pd.to_numeric(df[col], errors='coerce').fillna(0).astype('int32')
-        
-        for col in ['is_nsfw', 'is_spoiler', 'has_media', 'media_downloaded']:
-            if col in df.columns:
-                df[col] = df[col].astype(bool)
+        df = _typed_posts(pd.read_csv(posts_csv))
         
         output_file = output_path / f"{subreddit}_posts_{timestamp}.parquet"
         df.to_parquet(output_file, engine="pyarrow", compression="snappy")
@@ -129,7 +244,6 @@ def export_database_to_parquet(output_dir=None):
         except Exception as e:
             print(f"   ❌ Failed to export {table}: {e}")
     
-    conn.close()
     return exported
 
 
@@ -3,20 +3,61 @@
 Full-featured scraper with analytics, dashboard, notifications, and scheduling.
 """
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 import pandas as pd
+import asyncio
 import datetime
 import time
 import os
-import xml.etree.ElementTree as ET
 import argparse
 import random
 import sys
 import json
+import csv
+import io
+import atexit
+import threading
+import logging
 import subprocess
 import tempfile
-from urllib.parse import urlparse
+import shutil
+from concurrent.futures import Future, ThreadPoolExecutor, as_completed
+from itertools import islice
+from operator import itemgetter
 from pathlib import Path
 
+from scraper.common import (
+    EMPTY, IMAGE_URL_RE, IMG_EXT_RE, mirror_observed, mirror_order, url_ext
+)
+
+# Try importing lxml for faster RSS parsing (same ElementTree API)
+try:
+    from lxml import etree as ET
+    HAS_LXML = True
+    # Feeds are untrusted input: no entity expansion or network access
+    _XML_PARSER = ET.XMLParser(resolve_entities=False, no_network=True)
+except ImportError:
+    import xml.etree.ElementTree as ET
+    HAS_LXML = False
+    _XML_PARSER = None
+
+ATOM_NS = {'atom': 'http://www.w3.org/2005/Atom'}
+
+# Compile the feed XPaths once instead of re-parsing paths for every entry
+if HAS_LXML:
+    _ENTRY_XPATH = ET.XPath('atom:entry', namespaces=ATOM_NS)
+    _TITLE_XPATH = ET.XPath('string(atom:title)', namespaces=ATOM_NS)
+    _PUBLISHED_XPATH = ET.XPath('string(atom:published)', namespaces=ATOM_NS)
+    _LINK_XPATH = ET.XPath('string(atom:link/@href)', namespaces=ATOM_NS)
+
+# Try importing orjson for faster listing/comment JSON decoding
+try:
+    import orjson
+    HAS_ORJSON = True
+except ImportError:
+    HAS_ORJSON = False
+
 # --- CONFIGURATION ---
 USER_AGENT = "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36"
 
@@ -29,9 +70,107 @@ MIRRORS = [
     "https://redlib.tux.pizza"
 ]
 
-SEEN_URLS = set()
+# Max in-flight requests for the async scrape (--async)
+ASYNC_CONCURRENCY = 20
+
+# A failing mirror is skipped for 2**fails seconds (plus jitter), capped here;
+# Retry-After / X-Ratelimit-Reset from the mirror take precedence
+MIRROR_BACKOFF_MAX = 60
+
+# SEEN_URLS keeps at most this many permalinks, evicting the oldest first.
+# Listings only ever return recent posts, so losing the oldest history
+# costs at most a re-save of a very old post. None keeps everything.
+SEEN_URLS_MAX = 200000
+# Rows of posts.csv parsed at a time by load_history
+HISTORY_CHUNK = 50000
+
+# Both accept the raw response bytes
+json_loads = orjson.loads if HAS_ORJSON else json.loads
+
+# Per-page and per-post progress goes through this logger so -q/-v can
+# filter it; banners and summaries stay plain prints
+logger = logging.getLogger("scraper")
+_log_handler = logging.StreamHandler(sys.stdout)
+_log_handler.setFormatter(logging.Formatter("%(message)s"))
+logger.addHandler(_log_handler)
+logger.setLevel(logging.INFO)
+logger.propagate = False
+
+class PermalinkSet:
+    """
+    Set of seen permalinks, bounded to maxlen entries.
+    
+    Entries are kept in insertion order (a plain dict) so that, past
+    maxlen, the oldest-added permalinks are evicted first.
+    """
+    __slots__ = ("_permalinks", "maxlen")
+    
+    def __init__(self, maxlen=None):
+        self._permalinks = {}
+        self.maxlen = maxlen
+    
+    def __contains__(self, permalink):
+        return permalink in self._permalinks
+    
+    def __len__(self):
+        return len(self._permalinks)
+    
+    def _evict(self):
+        excess = len(self._permalinks) - self.maxlen
+        if excess > 0:
+            permalinks = self._permalinks
+            for permalink in list(islice(permalinks, excess)):
+                del permalinks[permalink]
+    
+    def add(self, permalink):
+        # Re-adding refreshes the entry to newest
+        self._permalinks.pop(permalink, None)
+        self._permalinks[permalink] = None
+        if self.maxlen is not None and len(self._permalinks) > self.maxlen:
+            self._evict()
+    
+    def update(self, permalinks):
+        self._permalinks.update(dict.fromkeys(permalinks))
+        if self.maxlen is not None:
+            self._evict()
+    
+    def discard(self, permalink):
+        self._permalinks.pop(permalink, None)
+    
+    def clear(self):
+        self._permalinks.clear()
+
+SEEN_URLS = PermalinkSet(SEEN_URLS_MAX)
+# Media URLs already fetched (or queued) during the current scrape
+DOWNLOADED_URLS = set()
+# Media files already on disk for the current scrape (one scandir at start)
+EXISTING_MEDIA = set()
 SESSION = requests.Session()
 SESSION.headers.update({"User-Agent": USER_AGENT})
+# Big enough pool that media, comments and listings to the same hosts reuse
+# open connections; transient 5xx are retried with backoff. 429s go straight
+# back to the caller, so the mirror backoff (not a sleep inside the adapter)
+# honours Retry-After and the scrape moves on to the next mirror
+_ADAPTER = HTTPAdapter(
+    pool_connections=32, pool_maxsize=64,
+    max_retries=Retry(total=3, backoff_factor=0.5, status_forcelist=[500, 502, 503, 504],
+                      raise_on_status=False)
+)
+SESSION.mount("https://", _ADAPTER)
+SESSION.mount("http://", _ADAPTER)
+
+# Media files of a post download in parallel; kept modest to bound the
+# bytes in flight (and below the pool size above)
+MEDIA_POOL = ThreadPoolExecutor(max_workers=16, thread_name_prefix="media")
+
+# Comment threads of a listing page are fetched in parallel, but no faster
+# than COMMENT_RATE requests/second on average (bursts up to COMMENT_BURST)
+COMMENT_POOL = ThreadPoolExecutor(max_workers=8, thread_name_prefix="comments")
+COMMENT_RATE = 2.0
+COMMENT_BURST = 8
+
+# Open CSV appenders keyed by path (handle, batch buffer, DictWriter, row getter)
+CSV_WRITERS = {}
 
 # --- DIRECTORY SETUP ---
 def setup_directories(target, prefix):
@@ -46,31 +185,107 @@ def setup_directories(target, prefix):
         "videos": f"{base_dir}/media/videos",
     }
     
-    for key in ["base", "media", "images", "videos"]:
-        if not os.path.exists(dirs[key]):
-            os.makedirs(dirs[key])
+    # The two leaf folders imply base and media; exist_ok replaces the exists() check
+    for key in ["images", "videos"]:
+        Path(dirs[key]).mkdir(parents=True, exist_ok=True)
     
     return dirs
 
 def get_file_path(target, type_prefix):
     """Legacy function for backward compatibility."""
-    if not os.path.exists("data"):
-        os.makedirs("data")
+    Path("data").mkdir(exist_ok=True)
     sanitized_target = target.replace("/", "_")
     return f"data/{type_prefix}_{sanitized_target}.csv"
 
+def _newest_history(rows):
+    """The newest SEEN_URLS_MAX history rows, oldest first."""
+    # ISO timestamps sort as strings; stable keeps file order on ties, and
+    # oldest first means later evictions drop the oldest history
+    rows = rows.sort_values('created_utc', kind='stable')
+    return rows if SEEN_URLS_MAX is None else rows.iloc[-SEEN_URLS_MAX:]
+
 def load_history(filepath):
     """Loads existing CSV history to prevent duplicates."""
     SEEN_URLS.clear()
     if os.path.exists(filepath):
         try:
-            df = pd.read_csv(filepath)
-            for url in df['permalink']:
-                SEEN_URLS.add(str(url))
+            # Only permalink/created_utc are parsed, straight into plain str
+            # objects (no NA scan, no Arrow string column), in chunks so a
+            # huge history never sits in memory whole
+            chunks = pd.read_csv(filepath, usecols=lambda c: c in ('permalink', 'created_utc'),
+                                 dtype=object, na_filter=False, chunksize=HISTORY_CHUNK)
+            newest = None
+            for chunk in chunks:
+                if 'created_utc' not in chunk:
+                    # Old files without timestamps fall back to file order
+                    chunk['created_utc'] = ''
+                chunk = chunk[chunk['permalink'] != '']
+                newest = chunk if newest is None else pd.concat([newest, chunk])
+                # Trim only at twice the cap so the sort runs every few chunks
+                if SEEN_URLS_MAX is not None and len(newest) > 2 * SEEN_URLS_MAX:
+                    newest = _newest_history(newest)
+            if newest is not None:
+                SEEN_URLS.update(_newest_history(newest)['permalink'])
             print(f"📚 Loaded {len(SEEN_URLS)} existing items from {filepath}")
         except:
             pass
 
+def _csv_appender(filepath, fieldnames):
+    """
+    Returns the cached (append handle, batch buffer, DictWriter, row getter)
+    for filepath.
+    
+    A new file gets the header for fieldnames; an existing file keeps its
+    own header's column order.
+    """
+    entry = CSV_WRITERS.get(filepath)
+    if entry is not None and os.path.exists(filepath):
+        return entry
+    if entry is not None:
+        entry[0].close()
+    
+    is_new = not os.path.exists(filepath) or os.path.getsize(filepath) == 0
+    if not is_new:
+        with open(filepath, newline='', encoding='utf-8') as f:
+            fieldnames = next(csv.reader(f), None) or fieldnames
+    
+    f = open(filepath, 'a', newline='', encoding='utf-8')
+    # Batches are rendered into buf so each one reaches the file in one write()
+    buf = io.StringIO()
+    writer = csv.DictWriter(buf, fieldnames=fieldnames, extrasaction='ignore')
+    # Pulls a row's values as a tuple in C, skipping DictWriter's per-row generator
+    row_values = itemgetter(*fieldnames) if len(fieldnames) > 1 else None
+    if is_new:
+        writer.writeheader()
+        f.write(buf.getvalue())
+    CSV_WRITERS[filepath] = (f, buf, writer, row_values)
+    return CSV_WRITERS[filepath]
+
+def _append_csv(rows, filepath, fieldnames):
+    f, buf, writer, row_values = _csv_appender(filepath, fieldnames)
+    buf.seek(0)
+    buf.truncate()
+    try:
+        if row_values is None:
+            raise KeyError
+        writer.writer.writerows(map(row_values, rows))
+    except KeyError:
+        # Some row lacks a column: let DictWriter fill the gaps
+        buf.seek(0)
+        buf.truncate()
+        writer.writerows(rows)
+    f.write(buf.getvalue())
+    f.flush()
+
+def close_csv_writers(*filepaths):
+    """Closes the CSV appenders for filepaths (default: every open one)."""
+    for filepath in filepaths or list(CSV_WRITERS):
+        entry = CSV_WRITERS.pop(filepath, None)
+        if entry is not None:
+            entry[0].close()
+
+atexit.register(close_csv_writers)
+
 def save_posts_csv(posts, filepath):
     """Saves posts to CSV with all metadata."""
     if not posts:
@@ -79,19 +294,15 @@ def save_posts_csv(posts, filepath):
     new_posts = [p for p in posts if p['permalink'] not in SEEN_URLS]
     
     if new_posts:
-        df = pd.DataFrame(new_posts)
-        if os.path.exists(filepath):
-            df.to_csv(filepath, mode='a', header=False, index=False)
-        else:
-            df.to_csv(filepath, index=False)
+        _append_csv(new_posts, filepath, POST_FIELDS)
         
         for p in new_posts:
             SEEN_URLS.add(p['permalink'])
         
-        print(f"✅ Saved {len(new_posts)} new posts")
+        logger.info(f"✅ Saved {len(new_posts)} new posts")
         return len(new_posts)
     else:
-        print("💤 No new unique posts found.")
+        logger.info("💤 No new unique posts found.")
         return 0
 
 def save_comments_csv(comments, filepath):
@@ -99,13 +310,9 @@ def save_comments_csv(comments, filepath):
     if not comments:
         return
     
-    df = pd.DataFrame(comments)
-    if os.path.exists(filepath):
-        df.to_csv(filepath, mode='a', header=False, index=False)
-    else:
-        df.to_csv(filepath, index=False)
+    _append_csv(comments, filepath, COMMENT_FIELDS)
     
-    print(f"💬 Saved {len(comments)} comments")
+    logger.info(f"💬 Saved {len(comments)} comments")
 
 # --- MEDIA DOWNLOAD ---
 def get_media_urls(post_data):
@@ -113,59 +320,75 @@ def get_media_urls(post_data):
     media = {"images": [], "videos": [], "galleries": []}
     
     url = post_data.get('url', '')
-    if any(ext in url.lower() for ext in ['.jpg', '.jpeg', '.png', '.gif', '.webp']):
+    if IMG_EXT_RE.search(url):
         media["images"].append(url)
     
     if 'i.redd.it' in url:
         media["images"].append(url)
     
     if post_data.get('is_video'):
-        reddit_video = post_data.get('media', {})
-        if reddit_video and 'reddit_video' in reddit_video:
-            video_url = reddit_video['reddit_video'].get('fallback_url', '')
+        reddit_video = (post_data.get('media') or EMPTY).get('reddit_video')
+        if reddit_video:
+            video_url = reddit_video.get('fallback_url')
             if video_url:
                 media["videos"].append(video_url.split('?')[0])
     
-    preview = post_data.get('preview', {})
-    if preview and 'images' in preview:
-        for img in preview['images']:
-            source = img.get('source', {})
-            if source.get('url'):
-                clean_url = source['url'].replace('&amp;', '&')
-                media["images"].append(clean_url)
+    # Listings are fetched with raw_json=1, so these URLs normally arrive
+    # unescaped and the '&amp;' replaces below return the string untouched;
+    # they stay for mirrors that ignore raw_json
+    for img in (post_data.get('preview') or EMPTY).get('images', ()):
+        source_url = (img.get('source') or EMPTY).get('url')
+        if source_url:
+            media["images"].append(source_url.replace('&amp;', '&'))
     
     if post_data.get('is_gallery'):
-        gallery_data = post_data.get('gallery_data', {})
-        media_metadata = post_data.get('media_metadata', {})
-        
-        if gallery_data and media_metadata:
-            for item in gallery_data.get('items', []):
-                media_id = item.get('media_id')
-                if media_id and media_id in media_metadata:
-                    meta = media_metadata[media_id]
-                    if meta.get('s', {}).get('u'):
-                        clean_url = meta['s']['u'].replace('&amp;', '&')
-                        media["galleries"].append(clean_url)
+        media_metadata = post_data.get('media_metadata')
+        if media_metadata:
+            for item in (post_data.get('gallery_data') or EMPTY).get('items', ()):
+                meta = media_metadata.get(item.get('media_id'))
+                gallery_url = (meta.get('s') or EMPTY).get('u') if meta else None
+                if gallery_url:
+                    media["galleries"].append(gallery_url.replace('&amp;', '&'))
     
     if 'youtube.com' in url or 'youtu.be' in url:
         media["videos"].append(url)
     
+    # The same URL often shows up as both url and preview; keep first occurrence
+    media["images"] = list(dict.fromkeys(media["images"]))
+    
     return media
 
+# Media bodies are copied in 1 MiB blocks rather than 8 KB Python-level chunks
+COPY_BUFFER = 1 << 20
+
+def _copy_response(response, f):
+    """Streams a response body into an open binary file."""
+    response.raw.decode_content = True
+    shutil.copyfileobj(response.raw, f, COPY_BUFFER)
+
 def download_media(url, save_path, media_type="image"):
     """Downloads a single media file."""
     try:
-        if os.path.exists(save_path):
-            return True
-        
-        response = SESSION.get(url, timeout=30, stream=True)
-        if response.status_code == 200:
-            with open(save_path, 'wb') as f:
-                for chunk in response.iter_content(chunk_size=8192):
-                    f.write(chunk)
-            return True
+        # Exclusive create doubles as the already-downloaded check
+        f = open(save_path, 'xb')
+    except FileExistsError:
+        return True
+    except OSError:
+        return False
+    
+    try:
+        with f, SESSION.get(url, timeout=30, stream=True) as response:
+            if response.status_code == 200:
+                _copy_response(response, f)
+                return True
     except Exception as e:
         pass
+    
+    # Don't leave an empty or partial file behind to be skipped next run
+    try:
+        os.remove(save_path)
+    except OSError:
+        pass
     return False
 
 def download_reddit_video_with_audio(video_url, save_path):
@@ -193,23 +416,21 @@ def download_reddit_video_with_audio(video_url, save_path):
         # Download video to temp file first
         with tempfile.NamedTemporaryFile(suffix='_video.mp4', delete=False) as video_temp:
             video_temp_path = video_temp.name
-            response = SESSION.get(video_url, timeout=60, stream=True)
-            if response.status_code != 200:
-                return False
-            for chunk in response.iter_content(chunk_size=8192):
-                video_temp.write(chunk)
+            with SESSION.get(video_url, timeout=60, stream=True) as response:
+                if response.status_code != 200:
+                    return False
+                _copy_response(response, video_temp)
         
         # Try to download audio
         audio_temp_path = None
         for audio_url in audio_urls:
             try:
-                response = SESSION.get(audio_url, timeout=30, stream=True)
-                if response.status_code == 200:
-                    with tempfile.NamedTemporaryFile(suffix='_audio.mp4', delete=False) as audio_temp:
-                        audio_temp_path = audio_temp.name
-                        for chunk in response.iter_content(chunk_size=8192):
-                            audio_temp.write(chunk)
-                    break
+                with SESSION.get(audio_url, timeout=30, stream=True) as response:
+                    if response.status_code == 200:
+                        with tempfile.NamedTemporaryFile(suffix='_audio.mp4', delete=False) as audio_temp:
+                            audio_temp_path = audio_temp.name
+                            _copy_response(response, audio_temp)
+                        break
             except:
                 continue
         
@@ -232,13 +453,13 @@ def download_reddit_video_with_audio(video_url, save_path):
                     return True
                 else:
                     # ffmpeg failed, fall back to video only
-                    print(f"   ⚠️ ffmpeg merge failed, saving video without audio")
+                    logger.warning(f"   ⚠️ ffmpeg merge failed, saving video without audio")
                     os.rename(video_temp_path, save_path)
                     os.unlink(audio_temp_path)
                     return True
             except FileNotFoundError:
                 # ffmpeg not installed, save video only
-                print(f"   ⚠️ ffmpeg not found, saving video without audio")
+                logger.warning(f"   ⚠️ ffmpeg not found, saving video without audio")
                 os.rename(video_temp_path, save_path)
                 if audio_temp_path:
                     os.unlink(audio_temp_path)
@@ -259,37 +480,105 @@ def download_reddit_video_with_audio(video_url, save_path):
         pass
     return False
 
-def download_post_media(post_data, dirs, post_id):
-    """Downloads all media from a post."""
+def _first_download(url):
+    """True the first time a media URL comes up in the current scrape."""
+    if url in DOWNLOADED_URLS:
+        return False
+    DOWNLOADED_URLS.add(url)
+    return True
+
+def _scan_existing_media(dirs):
+    """Lists the images/videos folders once so resumed scrapes skip files on disk."""
+    EXISTING_MEDIA.clear()
+    for key in ("images", "videos"):
+        try:
+            with os.scandir(dirs[key]) as entries:
+                EXISTING_MEDIA.update(os.path.join(dirs[key], entry.name) for entry in entries)
+        except OSError:
+            pass
+
+def submit_post_media(post_data, dirs, post_id):
+    """Queues all media of a post on MEDIA_POOL; returns {future: tally key}."""
     media = get_media_urls(post_data)
-    downloaded = {"images": 0, "videos": 0}
+    jobs = []  # (download function, url, save path, tally key)
     
     for i, img_url in enumerate(media["images"][:5]):
-        ext = os.path.splitext(urlparse(img_url).path)[1] or '.jpg'
+        if not _first_download(img_url):
+            continue
+        ext = url_ext(img_url)
         save_path = os.path.join(dirs["images"], f"{post_id}_{i}{ext}")
-        if download_media(img_url, save_path, "image"):
-            downloaded["images"] += 1
+        jobs.append((download_media, img_url, save_path, "images"))
     
     for i, img_url in enumerate(media["galleries"][:10]):
+        if not _first_download(img_url):
+            continue
         ext = '.jpg'
         save_path = os.path.join(dirs["images"], f"{post_id}_gallery_{i}{ext}")
-        if download_media(img_url, save_path, "gallery"):
-            downloaded["images"] += 1
+        jobs.append((download_media, img_url, save_path, "images"))
     
     for i, vid_url in enumerate(media["videos"][:2]):
-        if 'youtube' not in vid_url:
+        if 'youtube' not in vid_url and _first_download(vid_url):
             ext = '.mp4'
             save_path = os.path.join(dirs["videos"], f"{post_id}_{i}{ext}")
             # Use enhanced download for Reddit videos (includes audio)
             if 'v.redd.it' in vid_url or 'reddit.com' in vid_url:
-                if download_reddit_video_with_audio(vid_url, save_path):
-                    downloaded["videos"] += 1
-            elif download_media(vid_url, save_path, "video"):
-                downloaded["videos"] += 1
-    
+                jobs.append((download_reddit_video_with_audio, vid_url, save_path, "videos"))
+            else:
+                jobs.append((download_media, vid_url, save_path, "videos"))
+    
+    futures = {}
+    for fn, url, save_path, key in jobs:
+        if save_path in EXISTING_MEDIA:
+            # Already downloaded: counts as done without a pool round-trip
+            future = Future()
+            future.set_result(True)
+        else:
+            future = MEDIA_POOL.submit(fn, url, save_path)
+        futures[future] = key
+    return futures
+
+def collect_post_media(futures):
+    """Waits for a post's queued media; returns the downloaded counts."""
+    downloaded = {"images": 0, "videos": 0}
+    for future in as_completed(futures):
+        if future.result():
+            downloaded[futures[future]] += 1
     return downloaded
 
+def download_post_media(post_data, dirs, post_id):
+    """Downloads all media from a post (files fetched in parallel on MEDIA_POOL)."""
+    return collect_post_media(submit_post_media(post_data, dirs, post_id))
+
 # --- COMMENT SCRAPING ---
+class TokenBucket:
+    """Thread-safe token bucket; acquire() blocks until a request may go out."""
+    
+    def __init__(self, rate, burst):
+        self.rate = rate
+        self.capacity = burst
+        self.tokens = burst
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+    
+    def acquire(self):
+        while True:
+            with self.lock:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                wait = (1 - self.tokens) / self.rate
+            time.sleep(wait)
+
+COMMENT_BUCKET = TokenBucket(COMMENT_RATE, COMMENT_BURST)
+
+def _scrape_comments_limited(permalink):
+    """scrape_comments behind COMMENT_BUCKET, for COMMENT_POOL workers."""
+    COMMENT_BUCKET.acquire()
+    return scrape_comments(permalink)
+
 def scrape_comments(permalink, max_depth=3):
     """Scrapes comments from a post."""
     comments = []
@@ -304,7 +593,7 @@ def scrape_comments(permalink, max_depth=3):
         if response.status_code != 200:
             return comments
         
-        data = response.json()
+        data = json_loads(response.content)
         
         if len(data) > 1:
             comment_data = data[1]['data']['children']
@@ -314,18 +603,29 @@ def scrape_comments(permalink, max_depth=3):
         pass
     
     if len(comments) > 0:
-        print(f"   + Scraped {len(comments)} comments")
+        logger.info(f"   + Scraped {len(comments)} comments")
     
     return comments
 
 def parse_comments(comment_list, post_permalink, depth=0, max_depth=3):
-    """Recursively parses comments."""
+    """Parses a comment tree iteratively, replies right after their parent."""
     comments = []
     
     if depth > max_depth:
         return comments
     
-    for item in comment_list:
+    # Hot-loop names bound locally instead of looked up per comment
+    fromtimestamp = datetime.datetime.fromtimestamp
+    append = comments.append
+    
+    # One open iterator per thread level instead of one Python frame per reply list
+    stack = [(iter(comment_list), depth)]
+    while stack:
+        items, depth = stack[-1]
+        item = next(items, None)
+        if item is None:
+            stack.pop()
+            continue
         if item['kind'] != 't1':
             continue
         
@@ -338,73 +638,126 @@ def parse_comments(comment_list, post_permalink, depth=0, max_depth=3):
             "author": c.get('author'),
             "body": c.get('body', ''),
             "score": c.get('score', 0),
-            "created_utc": datetime.datetime.fromtimestamp(c.get('created_utc', 0)).isoformat(),
+            "created_utc": fromtimestamp(c.get('created_utc', 0)).isoformat(),
             "depth": depth,
             "is_submitter": c.get('is_submitter', False),
         }
-        comments.append(comment)
+        append(comment)
         
         replies = c.get('replies')
-        if replies and isinstance(replies, dict):
-            reply_children = replies.get('data', {}).get('children', [])
-            comments.extend(parse_comments(reply_children, post_permalink, depth + 1, max_depth))
+        if depth < max_depth and replies and isinstance(replies, dict):
+            stack.append((iter(replies.get('data', {}).get('children', [])), depth + 1))
     
     return comments
 
 # --- POST EXTRACTION ---
+# (column, listing key, default) in CSV column order; columns with a None key
+# are computed by extract_post_data
+POST_FIELD_MAP = (
+    ("id", "id", None),
+    ("title", "title", None),
+    ("author", "author", None),
+    ("created_utc", "created_utc", 0),
+    ("permalink", "permalink", None),
+    ("url", "url", None),
+    ("score", "score", 0),
+    ("upvote_ratio", "upvote_ratio", 0),
+    ("num_comments", "num_comments", 0),
+    ("num_crossposts", "num_crossposts", 0),
+    ("selftext", "selftext", ''),
+    ("post_type", None, None),
+    ("is_nsfw", "over_18", False),
+    ("is_spoiler", "spoiler", False),
+    ("flair", "link_flair_text", ''),
+    ("total_awards", "total_awards_received", 0),
+    ("has_media", None, None),
+    ("media_downloaded", None, False),
+    ("source", None, "History-Full"),
+)
+
+# posts.csv / comments.csv columns; rows are written in this order whatever
+# their dict order, and keys outside it are ignored
+POST_FIELDS = tuple(column for column, _, _ in POST_FIELD_MAP)
+COMMENT_FIELDS = ("post_permalink", "comment_id", "parent_id", "author", "body",
+                  "score", "created_utc", "depth", "is_submitter")
+
 def extract_post_data(post_json):
     """Extracts comprehensive post data."""
     p = post_json
-    
-    post_type = "text"
-    if p.get('is_video'):
-        post_type = "video"
-    elif p.get('is_gallery'):
-        post_type = "gallery"
-    elif any(ext in p.get('url', '').lower() for ext in ['.jpg', '.jpeg', '.png', '.gif', '.webp']) or 'i.redd.it' in p.get('url', ''):
-        post_type = "image"
-    elif p.get('is_self'):
-        post_type = "text"
-    else:
-        post_type = "link"
-    
+    post = {column: p.get(key, default) for column, key, default in POST_FIELD_MAP}
+    
+    url = p.get('url', '')
+    is_video = p.get('is_video', False)
+    is_gallery = p.get('is_gallery', False)
+    
+    post["created_utc"] = datetime.datetime.fromtimestamp(post["created_utc"]).isoformat()
+    post["url"] = p.get('url_overridden_by_dest', post["url"])
+    post["post_type"] = ("video" if is_video else
+                         "gallery" if is_gallery else
+                         "image" if IMAGE_URL_RE.search(url) else
+                         "text" if p.get('is_self') else
+                         "link")
+    post["has_media"] = is_video or is_gallery or 'i.redd.it' in url
+    return post
+
+# --- MIRROR SELECTION ---
+def _new_mirror_state():
+    """Per-scrape mirror state; shuffled once so ties between equal mirrors vary."""
+    mirrors = MIRRORS.copy()
+    random.shuffle(mirrors)
     return {
-        "id": p.get('id'),
-        "title": p.get('title'),
-        "author": p.get('author'),
-        "created_utc": datetime.datetime.fromtimestamp(p.get('created_utc', 0)).isoformat(),
-        "permalink": p.get('permalink'),
-        "url": p.get('url_overridden_by_dest', p.get('url')),
-        "score": p.get('score', 0),
-        "upvote_ratio": p.get('upvote_ratio', 0),
-        "num_comments": p.get('num_comments', 0),
-        "num_crossposts": p.get('num_crossposts', 0),
-        "selftext": p.get('selftext', ''),
-        "post_type": post_type,
-        "is_nsfw": p.get('over_18', False),
-        "is_spoiler": p.get('spoiler', False),
-        "flair": p.get('link_flair_text', ''),
-        "total_awards": p.get('total_awards_received', 0),
-        "has_media": p.get('is_video', False) or p.get('is_gallery', False) or 'i.redd.it' in p.get('url', ''),
-        "media_downloaded": False,
-        "source": "History-Full"
+        "mirrors": mirrors,
+        "backoff": {m: {"next_ok": 0.0, "fails": 0} for m in mirrors},
     }
 
-# --- FULL HISTORY SCRAPE ---
-def run_full_history(target, limit, is_user=False, download_media_flag=True, 
-                     scrape_comments_flag=True, dry_run=False, use_plugins=False):
+def _retry_after(headers):
+    """Seconds a mirror asked us to wait (Retry-After / X-Ratelimit-*), or None."""
+    value = headers.get("Retry-After")
+    if value is None:
+        try:
+            if float(headers.get("X-Ratelimit-Remaining")) < 1:
+                value = headers.get("X-Ratelimit-Reset")
+        except (TypeError, ValueError):
+            pass
+    try:
+        return max(0.0, float(value))
+    except (TypeError, ValueError):
+        return None
+
+def _mirror_ready(state, base_url):
+    """False while a mirror is inside its backoff window."""
+    return time.time() >= state["backoff"][base_url]["next_ok"]
+
+def _mirror_failed(state, base_url, headers=None):
+    """Back a mirror off exponentially, or for as long as it asked."""
+    backoff = state["backoff"][base_url]
+    backoff["fails"] += 1
+    delay = _retry_after(headers) if headers is not None else None
+    if delay is None:
+        delay = min(MIRROR_BACKOFF_MAX, 2 ** backoff["fails"] + random.random())
+    backoff["next_ok"] = time.time() + delay
+
+def _mirror_wait(state):
+    """Seconds until the first mirror leaves its backoff window."""
+    soonest = min(b["next_ok"] for b in state["backoff"].values())
+    return min(MIRROR_BACKOFF_MAX, max(1.0, soonest - time.time()))
+
+def _mirror_succeeded(state, base_url, headers=None):
     """
-    Full scrape with images, videos, and comments.
+    Record that a mirror served a listing page.
     
-    Args:
-        target: Subreddit or username
-        limit: Maximum posts to scrape
-        is_user: True if target is a user
-        download_media_flag: Download images/videos
-        scrape_comments_flag: Scrape comments
-        dry_run: Simulate without saving data
-        use_plugins: Run post-processing plugins
+    An exhausted rate-limit budget in the response headers still backs the
+    mirror off until its reset.
     """
+    backoff = state["backoff"][base_url]
+    backoff["fails"] = 0
+    delay = _retry_after(headers) if headers is not None else None
+    backoff["next_ok"] = time.time() + delay if delay else 0.0
+
+# --- FULL HISTORY SCRAPE ---
+def _start_scrape(target, limit, is_user, download_media_flag, scrape_comments_flag,
+                  dry_run, use_plugins):
+    """Print the scrape banner, open the job record and load history."""
     prefix = "u" if is_user else "r"
     mode = "full" if download_media_flag and scrape_comments_flag else "history"
     
@@ -424,7 +777,7 @@ def run_full_history(target, limit, is_user=False, download_media_flag=True,
     # Start job tracking
     job_id = None
     try:
-        from export.database import start_job_record, complete_job_record
+        from export.database import start_job_record
         job_id = start_job_record(target, mode, is_user, dry_run)
     except Exception as e:
         print(f"⚠️ Job tracking unavailable: {e}")
@@ -432,6 +785,96 @@ def run_full_history(target, limit, is_user=False, download_media_flag=True,
     # Setup directories (even for dry run, to check existing data)
     dirs = setup_directories(target, prefix)
     load_history(dirs["posts"])
+    DOWNLOADED_URLS.clear()
+    if download_media_flag and not dry_run:
+        _scan_existing_media(dirs)
+    
+    return job_id, dirs
+
+def _run_plugins(posts, comments):
+    """Run post-processing plugins on the collected data."""
+    print("\n🔌 Running post-processing plugins...")
+    try:
+        from plugins import load_plugins, run_plugins
+        plugins = load_plugins()
+        if plugins:
+            posts, comments = run_plugins(posts, comments, plugins)
+            print(f"   ✅ Processed {len(posts)} posts with {len(plugins)} plugins")
+        else:
+            print("   ⚠️ No plugins found")
+    except Exception as e:
+        print(f"   ⚠️ Plugin error: {e}")
+    return posts, comments
+
+def _finish_scrape(dirs, job_id, dry_run, total_posts, total_comments, total_media,
+                   start_time, error_msg):
+    """Close the CSVs, write posts.parquet, close the job record and print the summary."""
+    duration = time.time() - start_time
+    close_csv_writers(dirs["posts"], dirs["comments"])
+    
+    # Typed Parquet copy of posts for the dashboard and analytics
+    if not dry_run:
+        try:
+            from export.parquet import sync_posts_parquet
+            sync_posts_parquet(dirs['base'])
+        except Exception as e:
+            print(f"⚠️ Failed to write posts.parquet: {e}")
+    
+    # Complete job tracking
+    if job_id:
+        try:
+            from export.database import complete_job_record
+            status = 'failed' if error_msg else 'completed'
+            complete_job_record(
+                job_id, status, 
+                total_posts, total_comments, 
+                total_media['images'] + total_media['videos'],
+                error_msg
+            )
+        except Exception as e:
+            print(f"⚠️ Failed to complete job record: {e}")
+    
+    # Summary
+    print("\n" + "=" * 50)
+    if dry_run:
+        print("🧪 DRY RUN COMPLETE!")
+        print(f"   📊 Would scrape: {total_posts} posts")
+        print(f"   💬 Would scrape: {total_comments} comments")
+    else:
+        print("✅ SCRAPE COMPLETE!")
+        print(f"   📁 Data saved to: {dirs['base']}")
+        print(f"   📊 Total posts: {total_posts}")
+        print(f"   🖼️  Total images: {total_media['images']}")
+        print(f"   🎬 Total videos: {total_media['videos']}")
+        print(f"   💬 Total comments: {total_comments}")
+    print(f"   ⏱️  Duration: {duration:.1f}s")
+    
+    return {
+        'posts': total_posts,
+        'images': total_media['images'],
+        'videos': total_media['videos'],
+        'comments': total_comments,
+        'duration': f"{duration:.1f}s",
+        'dry_run': dry_run,
+        'job_id': job_id
+    }
+
+def run_full_history(target, limit, is_user=False, download_media_flag=True, 
+                     scrape_comments_flag=True, dry_run=False, use_plugins=False):
+    """
+    Full scrape with images, videos, and comments.
+    
+    Args:
+        target: Subreddit or username
+        limit: Maximum posts to scrape
+        is_user: True if target is a user
+        download_media_flag: Download images/videos
+        scrape_comments_flag: Scrape comments
+        dry_run: Simulate without saving data
+        use_plugins: Run post-processing plugins
+    """
+    job_id, dirs = _start_scrape(target, limit, is_user, download_media_flag,
+                                 scrape_comments_flag, dry_run, use_plugins)
     
     after = None
     total_posts = 0
@@ -441,13 +884,15 @@ def run_full_history(target, limit, is_user=False, download_media_flag=True,
     all_scraped_comments = []
     start_time = time.time()
     error_msg = None
+    mirror_state = _new_mirror_state()
     
     try:
         while total_posts < limit:
-            random.shuffle(MIRRORS)
             success = False
             
-            for base_url in MIRRORS:
+            for base_url in mirror_order(mirror_state["mirrors"]):
+                if not _mirror_ready(mirror_state, base_url):
+                    continue
                 try:
                     if is_user:
                         path = f"/user/{target}/submitted.json"
@@ -460,43 +905,62 @@ def run_full_history(target, limit, is_user=False, download_media_flag=True,
                     if after:
                         target_url += f"&after={after}"
                     
-                    print(f"\n📡 Fetching from: {base_url}")
-                    response = SESSION.get(target_url, timeout=15)
+                    logger.info(f"\n📡 Fetching from: {base_url}")
+                    started = time.monotonic()
+                    try:
+                        response = SESSION.get(target_url, timeout=15)
+                    except Exception:
+                        mirror_observed(base_url, False, time.monotonic() - started)
+                        raise
+                    mirror_observed(base_url, response.status_code == 200, time.monotonic() - started)
+                    logger.debug(f"   ⏱️ {base_url} answered {response.status_code} in {time.monotonic() - started:.2f}s")
                     
                     if response.status_code == 200:
-                        data = response.json()
+                        data = json_loads(response.content)
                         posts = []
                         batch_comments = []
                         
                         children = data['data']['children']
-                        print(f"   Found {len(children)} posts in this batch")
+                        logger.info(f"   Found {len(children)} posts in this batch")
                         
+                        media_jobs = []  # (post, queued media futures)
                         for child in children:
                             p = child['data']
-                            post = extract_post_data(p)
-                            
-                            if post['permalink'] in SEEN_URLS:
+                            # Dedupe on the raw listing before extraction or media work
+                            if p.get('permalink') in SEEN_URLS:
                                 continue
                             
-                            # Download media (skip in dry run)
+                            post = extract_post_data(p)
+                            
+                            # Queue media (skip in dry run); the whole page downloads
+                            # in the background while comments are fetched
                             if download_media_flag and not dry_run:
-                                downloaded = download_post_media(p, dirs, post['id'])
-                                post['media_downloaded'] = downloaded['images'] > 0 or downloaded['videos'] > 0
-                                total_media['images'] += downloaded['images']
-                                total_media['videos'] += downloaded['videos']
-                                
-                                if downloaded['images'] > 0 or downloaded['videos'] > 0:
-                                    print(f"   + Downloaded: {downloaded['images']} images, {downloaded['videos']} videos")
+                                media_jobs.append((post, submit_post_media(p, dirs, post['id'])))
                             
                             posts.append(post)
+                        
+                        # Scrape comments
+                        if scrape_comments_flag:
+                            comment_futures = []
+                            for post in posts:
+                                if post['num_comments'] > 0:
+                                    logger.info(f"   💬 Fetching comments for: {post['title'][:40]}...")
+                                    comment_futures.append(COMMENT_POOL.submit(_scrape_comments_limited, post['permalink']))
                             
-                            # Scrape comments
-                            if scrape_comments_flag and post['num_comments'] > 0:
-                                print(f"   💬 Fetching comments for: {post['title'][:40]}...")
-                                comments = scrape_comments(post['permalink'])
+                            # Results are collected in post order
+                            for future in comment_futures:
+                                comments = future.result()
                                 batch_comments.extend(comments)
                                 total_comments += len(comments)
-                                time.sleep(1)
+                        
+                        for post, futures in media_jobs:
+                            downloaded = collect_post_media(futures)
+                            post['media_downloaded'] = downloaded['images'] > 0 or downloaded['videos'] > 0
+                            total_media['images'] += downloaded['images']
+                            total_media['videos'] += downloaded['videos']
+                            
+                            if downloaded['images'] > 0 or downloaded['videos'] > 0:
+                                logger.info(f"   + Downloaded: {downloaded['images']} images, {downloaded['videos']} videos")
                         
                         # Collect for plugins
                         all_scraped_posts.extend(posts)
@@ -512,95 +976,300 @@ def run_full_history(target, limit, is_user=False, download_media_flag=True,
                         else:
                             # In dry run, just count
                             total_posts += len(posts)
-                            print(f"   🧪 [DRY RUN] Would save {len(posts)} posts")
+                            logger.info(f"   🧪 [DRY RUN] Would save {len(posts)} posts")
                         
-                        print(f"\n📊 Progress: {total_posts}/{limit} posts")
-                        print(f"   🖼️  Images: {total_media['images']} | 🎬 Videos: {total_media['videos']}")
-                        print(f"   💬 Comments: {total_comments}")
+                        logger.info(f"\n📊 Progress: {total_posts}/{limit} posts")
+                        logger.info(f"   🖼️  Images: {total_media['images']} | 🎬 Videos: {total_media['videos']}")
+                        logger.info(f"   💬 Comments: {total_comments}")
                         
                         after = data['data'].get('after')
                         if not after:
-                            print("\n🏁 Reached end of available history.")
+                            logger.info("\n🏁 Reached end of available history.")
                             break
                         
                         success = True
                         break
+                    
+                    _mirror_failed(mirror_state, base_url, response.headers)
                         
                 except Exception as e:
-                    print(f"   ⚠️ Error with {base_url}: {e}")
+                    logger.warning(f"   ⚠️ Error with {base_url}: {e}")
+                    _mirror_failed(mirror_state, base_url)
                     continue
             
             if not after:
                 break
                 
             if not success:
-                print("\n❌ All sources failed. Waiting 30s...")
-                time.sleep(30)
+                wait = _mirror_wait(mirror_state)
+                logger.warning(f"\n❌ All sources failed. Waiting {wait:.0f}s...")
+                time.sleep(wait)
             else:
-                print(f"\n⏸️ Cooling down (3s)...")
+                _mirror_succeeded(mirror_state, base_url, response.headers)
+                logger.info(f"\n⏸️ Cooling down (3s)...")
                 time.sleep(3)
         
         # Run plugins on collected data
         if use_plugins and (all_scraped_posts or all_scraped_comments):
-            print("\n🔌 Running post-processing plugins...")
-            try:
-                from plugins import load_plugins, run_plugins
-                plugins = load_plugins()
-                if plugins:
-                    all_scraped_posts, all_scraped_comments = run_plugins(
-                        all_scraped_posts, all_scraped_comments, plugins
-                    )
-                    print(f"   ✅ Processed {len(all_scraped_posts)} posts with {len(plugins)} plugins")
-                else:
-                    print("   ⚠️ No plugins found")
-            except Exception as e:
-                print(f"   ⚠️ Plugin error: {e}")
+            all_scraped_posts, all_scraped_comments = _run_plugins(all_scraped_posts, all_scraped_comments)
     
     except Exception as e:
         error_msg = str(e)
         print(f"\n❌ Scrape error: {e}")
     
-    duration = time.time() - start_time
+    return _finish_scrape(dirs, job_id, dry_run, total_posts, total_comments, total_media,
+                          start_time, error_msg)
+
+# --- ASYNC FULL HISTORY SCRAPE ---
+async def download_post_media_async(session, sem, post_data, dirs, post_id):
+    """Downloads all media from a post concurrently (async download_post_media)."""
+    from scraper.async_scraper import download_media_async, download_reddit_video_with_audio_async
     
-    # Complete job tracking
-    if job_id:
+    media = get_media_urls(post_data)
+    jobs = []  # (download coroutine function, url, save path, tally key)
+    
+    for i, img_url in enumerate(media["images"][:5]):
+        if not _first_download(img_url):
+            continue
+        ext = url_ext(img_url)
+        save_path = os.path.join(dirs["images"], f"{post_id}_{i}{ext}")
+        jobs.append((download_media_async, img_url, save_path, "images"))
+    
+    for i, img_url in enumerate(media["galleries"][:10]):
+        if not _first_download(img_url):
+            continue
+        save_path = os.path.join(dirs["images"], f"{post_id}_gallery_{i}.jpg")
+        jobs.append((download_media_async, img_url, save_path, "images"))
+    
+    for i, vid_url in enumerate(media["videos"][:2]):
+        if 'youtube' not in vid_url and _first_download(vid_url):
+            save_path = os.path.join(dirs["videos"], f"{post_id}_{i}.mp4")
+            # Use enhanced download for Reddit videos (includes audio)
+            if 'v.redd.it' in vid_url or 'reddit.com' in vid_url:
+                jobs.append((download_reddit_video_with_audio_async, vid_url, save_path, "videos"))
+            else:
+                jobs.append((download_media_async, vid_url, save_path, "videos"))
+    
+    downloaded = {"images": 0, "videos": 0}
+    kinds = []
+    tasks = []
+    for fn, url, save_path, key in jobs:
+        if save_path in EXISTING_MEDIA:
+            downloaded[key] += 1
+            continue
+        kinds.append(key)
+        tasks.append(fn(session, url, save_path, sem))
+    
+    results = await asyncio.gather(*tasks, return_exceptions=True)
+    for kind, ok in zip(kinds, results):
+        if ok is True:
+            downloaded[kind] += 1
+    return downloaded
+
+async def scrape_comments_async(session, sem, permalink, max_depth=3):
+    """Scrapes comments from a post without blocking the event loop."""
+    import aiohttp
+    comments = []
+    
+    try:
+        if not permalink.startswith('http'):
+            url = f"https://old.reddit.com{permalink}.json?limit=100"
+        else:
+            url = f"{permalink}.json?limit=100"
+        
+        async with sem:
+            async with session.get(url, timeout=aiohttp.ClientTimeout(total=15)) as response:
+                if response.status != 200:
+                    return comments
+                data = json_loads(await response.read())
+        
+        if len(data) > 1:
+            comment_data = data[1]['data']['children']
+            comments = parse_comments(comment_data, permalink, depth=0, max_depth=max_depth)
+    
+    except Exception as e:
+        pass
+    
+    if len(comments) > 0:
+        logger.info(f"   + Scraped {len(comments)} comments")
+    
+    return comments
+
+async def run_full_history_async(target, limit, is_user=False, download_media_flag=True,
+                                 scrape_comments_flag=True, dry_run=False, use_plugins=False):
+    """
+    run_full_history() on aiohttp: each page's media downloads and comment
+    fetches run concurrently, at most ASYNC_CONCURRENCY requests at a time.
+    
+    Same arguments, output files and return value as run_full_history().
+    """
+    import aiohttp
+    
+    job_id, dirs = _start_scrape(target, limit, is_user, download_media_flag,
+                                 scrape_comments_flag, dry_run, use_plugins)
+    
+    after = None
+    total_posts = 0
+    total_media = {"images": 0, "videos": 0}
+    total_comments = 0
+    all_scraped_posts = []  # For plugin processing
+    all_scraped_comments = []
+    start_time = time.time()
+    error_msg = None
+    
+    mirror_state = _new_mirror_state()
+    sem = asyncio.BoundedSemaphore(ASYNC_CONCURRENCY)
+    connector = aiohttp.TCPConnector(limit=64, limit_per_host=16, keepalive_timeout=30)
+    
+    async with aiohttp.ClientSession(connector=connector, headers={"User-Agent": USER_AGENT}) as session:
         try:
-            status = 'failed' if error_msg else 'completed'
-            complete_job_record(
-                job_id, status, 
-                total_posts, total_comments, 
-                total_media['images'] + total_media['videos'],
-                error_msg
-            )
+            while total_posts < limit:
+                success = False
+                
+                for base_url in mirror_order(mirror_state["mirrors"]):
+                    if not _mirror_ready(mirror_state, base_url):
+                        continue
+                    try:
+                        if is_user:
+                            path = f"/user/{target}/submitted.json"
+                        else:
+                            path = f"/r/{target}/new.json"
+                        
+                        batch_size = min(100, limit - total_posts)
+                        target_url = f"{base_url}{path}?limit={batch_size}&raw_json=1"
+                        if after:
+                            target_url += f"&after={after}"
+                        
+                        logger.info(f"\n📡 Fetching from: {base_url}")
+                        async with sem:
+                            started = time.monotonic()
+                            try:
+                                async with session.get(target_url, timeout=aiohttp.ClientTimeout(total=15)) as response:
+                                    body = await response.read()
+                            except Exception:
+                                mirror_observed(base_url, False, time.monotonic() - started)
+                                raise
+                            mirror_observed(base_url, response.status == 200, time.monotonic() - started)
+                            logger.debug(f"   ⏱️ {base_url} answered {response.status} in {time.monotonic() - started:.2f}s")
+                        
+                        if response.status != 200:
+                            _mirror_failed(mirror_state, base_url, response.headers)
+                            continue
+                        data = json_loads(body)
+                        
+                        children = data['data']['children']
+                        logger.info(f"   Found {len(children)} posts in this batch")
+                        
+                        posts = []
+                        raw_posts = []
+                        for child in children:
+                            p = child['data']
+                            if p.get('permalink') in SEEN_URLS:
+                                continue
+                            post = extract_post_data(p)
+                            posts.append(post)
+                            raw_posts.append(p)
+                        
+                        # Media (skipped in dry run) and comments for the whole page at once
+                        media_tasks = []
+                        if download_media_flag and not dry_run:
+                            media_tasks = [download_post_media_async(session, sem, p, dirs, post['id'])
+                                           for p, post in zip(raw_posts, posts)]
+                        comment_tasks = []
+                        if scrape_comments_flag:
+                            comment_tasks = [scrape_comments_async(session, sem, post['permalink'])
+                                             for post in posts if post['num_comments'] > 0]
+                            if comment_tasks:
+                                logger.info(f"   💬 Fetching comments for {len(comment_tasks)} posts...")
+                        
+                        results = await asyncio.gather(*media_tasks, *comment_tasks, return_exceptions=True)
+                        
+                        for post, downloaded in zip(posts, results[:len(media_tasks)]):
+                            if not isinstance(downloaded, dict):
+                                continue
+                            post['media_downloaded'] = downloaded['images'] > 0 or downloaded['videos'] > 0
+                            total_media['images'] += downloaded['images']
+                            total_media['videos'] += downloaded['videos']
+                        
+                        batch_comments = []
+                        for comments in results[len(media_tasks):]:
+                            if isinstance(comments, list):
+                                batch_comments.extend(comments)
+                        total_comments += len(batch_comments)
+                        
+                        # Collect for plugins
+                        all_scraped_posts.extend(posts)
+                        all_scraped_comments.extend(batch_comments)
+                        
+                        # Save data (skip in dry run)
+                        if not dry_run:
+                            saved = save_posts_csv(posts, dirs["posts"])
+                            total_posts += saved
+                            
+                            if batch_comments:
+                                save_comments_csv(batch_comments, dirs["comments"])
+                        else:
+                            # In dry run, just count
+                            total_posts += len(posts)
+                            logger.info(f"   🧪 [DRY RUN] Would save {len(posts)} posts")
+                        
+                        logger.info(f"\n📊 Progress: {total_posts}/{limit} posts")
+                        logger.info(f"   🖼️  Images: {total_media['images']} | 🎬 Videos: {total_media['videos']}")
+                        logger.info(f"   💬 Comments: {total_comments}")
+                        
+                        after = data['data'].get('after')
+                        if not after:
+                            logger.info("\n🏁 Reached end of available history.")
+                            break
+                        
+                        success = True
+                        break
+                    
+                    except Exception as e:
+                        logger.warning(f"   ⚠️ Error with {base_url}: {e}")
+                        _mirror_failed(mirror_state, base_url)
+                        continue
+                
+                if not after:
+                    break
+                
+                if not success:
+                    wait = _mirror_wait(mirror_state)
+                    logger.warning(f"\n❌ All sources failed. Waiting {wait:.0f}s...")
+                    await asyncio.sleep(wait)
+                else:
+                    _mirror_succeeded(mirror_state, base_url, response.headers)
+                    logger.info(f"\n⏸️ Cooling down (3s)...")
+                    await asyncio.sleep(3)
+            
+            # Run plugins on collected data
+            if use_plugins and (all_scraped_posts or all_scraped_comments):
+                all_scraped_posts, all_scraped_comments = _run_plugins(all_scraped_posts, all_scraped_comments)
+        
         except Exception as e:
-            print(f"⚠️ Failed to complete job record: {e}")
-    
-    # Summary
-    print("\n" + "=" * 50)
-    if dry_run:
-        print("🧪 DRY RUN COMPLETE!")
-        print(f"   📊 Would scrape: {total_posts} posts")
-        print(f"   💬 Would scrape: {total_comments} comments")
-    else:
-        print("✅ SCRAPE COMPLETE!")
-        print(f"   📁 Data saved to: {dirs['base']}")
-        print(f"   📊 Total posts: {total_posts}")
-        print(f"   🖼️  Total images: {total_media['images']}")
-        print(f"   🎬 Total videos: {total_media['videos']}")
-        print(f"   💬 Total comments: {total_comments}")
-    print(f"   ⏱️  Duration: {duration:.1f}s")
+            error_msg = str(e)
+            print(f"\n❌ Scrape error: {e}")
     
-    return {
-        'posts': total_posts,
-        'images': total_media['images'],
-        'videos': total_media['videos'],
-        'comments': total_comments,
-        'duration': f"{duration:.1f}s",
-        'dry_run': dry_run,
-        'job_id': job_id
-    }
+    return _finish_scrape(dirs, job_id, dry_run, total_posts, total_comments, total_media,
+                          start_time, error_msg)
 
 # --- MONITOR MODE ---
+# rss_url -> (ETag, Last-Modified) of the last feed we parsed, so an unchanged
+# feed comes back as an empty 304
+RSS_CACHE = {}
+
+def _feed_entries(root):
+    """Yield (title, published, link) for each entry of a parsed Atom feed."""
+    if HAS_LXML:
+        for entry in _ENTRY_XPATH(root):
+            yield str(_TITLE_XPATH(entry)), str(_PUBLISHED_XPATH(entry)), str(_LINK_XPATH(entry))
+        return
+    
+    for entry in root.findall('atom:entry', ATOM_NS):
+        yield (entry.find('atom:title', ATOM_NS).text,
+               entry.find('atom:published', ATOM_NS).text,
+               entry.find('atom:link', ATOM_NS).attrib['href'])
+
 def run_monitor(target, is_user=False):
     prefix = "u" if is_user else "r"
     if is_user:
@@ -611,25 +1280,35 @@ def run_monitor(target, is_user=False):
     print(f"[{datetime.datetime.now()}] 📡 Checking RSS for {prefix}/{target}...")
     
     try:
-        response = SESSION.get(rss_url, timeout=15)
+        headers = {}
+        etag, last_modified = RSS_CACHE.get(rss_url, (None, None))
+        if etag:
+            headers["If-None-Match"] = etag
+        if last_modified:
+            headers["If-Modified-Since"] = last_modified
+        
+        response = SESSION.get(rss_url, headers=headers, timeout=15)
+        
+        if response.status_code == 304:
+            print("💤 Feed unchanged since last check.")
+            return
         
         if response.status_code != 200:
             print(f"❌ RSS blocked (Status {response.status_code}), trying JSON...")
             run_full_history(target, 25, is_user, download_media_flag=False, scrape_comments_flag=False)
             return
 
-        root = ET.fromstring(response.content)
-        namespace = {'atom': 'http://www.w3.org/2005/Atom'}
+        root = ET.fromstring(response.content, _XML_PARSER)
         posts = []
         
-        for entry in root.findall('atom:entry', namespace):
+        for title, published, link in _feed_entries(root):
             posts.append({
                 "id": "",
-                "title": entry.find('atom:title', namespace).text,
+                "title": title,
                 "author": "",
-                "created_utc": entry.find('atom:published', namespace).text,
-                "permalink": entry.find('atom:link', namespace).attrib['href'],
-                "url": entry.find('atom:link', namespace).attrib['href'],
+                "created_utc": published,
+                "permalink": link,
+                "url": link,
                 "score": 0,
                 "upvote_ratio": 0,
                 "num_comments": 0,
@@ -647,6 +1326,8 @@ def run_monitor(target, is_user=False):
         
         dirs = setup_directories(target, prefix)
         save_posts_csv(posts, dirs["posts"])
+        # Only remember validators once the feed's posts are safely saved
+        RSS_CACHE[rss_url] = (response.headers.get("ETag"), response.headers.get("Last-Modified"))
 
     except Exception as e:
         print(f"❌ Monitor Error: {e}")
@@ -660,10 +1341,12 @@ def main():
 Commands:
   SCRAPING:
     python main.py <target> --mode full --limit 100
+    python main.py <target> --mode full --async # Concurrent media/comments
     python main.py <target> --mode history --limit 500
     python main.py <target> --mode monitor
     python main.py <target> --dry-run           # Test without saving
     python main.py <target> --plugins           # Enable post-processing
+    python main.py <target> -q                  # Only banner, warnings and summary
     
   SEARCH:
     python main.py --search "keyword" --subreddit delhi
@@ -698,6 +1381,10 @@ Commands:
     parser.add_argument("--limit", type=int, default=100, help="Max posts to scrape")
     parser.add_argument("--no-media", action="store_true", help="Skip media download")
     parser.add_argument("--no-comments", action="store_true", help="Skip comments")
+    parser.add_argument("--async", dest="use_async", action="store_true",
+                        help="Fetch media and comments concurrently (aiohttp)")
+    parser.add_argument("-v", "--verbose", action="store_true", help="Also log per-request mirror timings")
+    parser.add_argument("-q", "--quiet", action="store_true", help="Hide per-page and per-post progress")
     
     # Dashboard
     parser.add_argument("--dashboard", action="store_true", help="Launch web dashboard")
@@ -735,6 +1422,11 @@ Commands:
     
     args = parser.parse_args()
     
+    if args.quiet:
+        logger.setLevel(logging.WARNING)
+    elif args.verbose:
+        logger.setLevel(logging.DEBUG)
+    
     print("=" * 50)
     print("🤖 UNIVERSAL REDDIT SCRAPER SUITE")
     print("=" * 50)
@@ -825,8 +1517,9 @@ Commands:
         posts = df.to_dict('records')
         
         if args.sentiment:
-            from analytics.sentiment import analyze_posts_sentiment
-            analyzed, counts = analyze_posts_sentiment(posts)
+            from analytics.sentiment import analyze_posts_sentiment_df, sentiment_label_counts
+            scores, labels = analyze_posts_sentiment_df(df)
+            counts = sentiment_label_counts(labels)
             print(f"\n😀 Sentiment Analysis:")
             print(f"   Positive: {counts['positive']}")
             print(f"   Neutral:  {counts['neutral']}")
@@ -866,14 +1559,25 @@ Commands:
             run_monitor(args.target, args.user)
             time.sleep(300)
     elif args.mode == "history":
-        run_full_history(args.target, args.limit, args.user, 
-                        download_media_flag=False, scrape_comments_flag=False,
-                        dry_run=args.dry_run, use_plugins=args.plugins)
+        if args.use_async:
+            asyncio.run(run_full_history_async(args.target, args.limit, args.user,
+                                               download_media_flag=False, scrape_comments_flag=False,
+                                               dry_run=args.dry_run, use_plugins=args.plugins))
+        else:
+            run_full_history(args.target, args.limit, args.user, 
+                            download_media_flag=False, scrape_comments_flag=False,
+                            dry_run=args.dry_run, use_plugins=args.plugins)
     else:
-        run_full_history(args.target, args.limit, args.user,
-                        download_media_flag=not args.no_media,
-                        scrape_comments_flag=not args.no_comments,
-                        dry_run=args.dry_run, use_plugins=args.plugins)
+        if args.use_async:
+            asyncio.run(run_full_history_async(args.target, args.limit, args.user,
+                                               download_media_flag=not args.no_media,
+                                               scrape_comments_flag=not args.no_comments,
+                                               dry_run=args.dry_run, use_plugins=args.plugins))
+        else:
+            run_full_history(args.target, args.limit, args.user,
+                            download_media_flag=not args.no_media,
+                            scrape_comments_flag=not args.no_comments,
+                            dry_run=args.dry_run, use_plugins=args.plugins)
 
 if __name__ == "__main__":
     main()
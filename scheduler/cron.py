@@ -15,6 +15,8 @@ class CronScheduler:
         self.jobs = []
         self.running = False
         self.thread = None
+        # Set by anything that changes the schedule, to cut the loop's sleep short
+        self._wake = threading.Event()
     
     def add_job(self, target, mode='full', limit=100, is_user=False, 
                 interval_minutes=60, run_at_start=True):
@@ -43,12 +45,14 @@ class CronScheduler:
             'run_count': 0
         }
         self.jobs.append(job)
+        self._wake.set()
         print(f"📅 Added job #{job['id']}: {'u/' if is_user else 'r/'}{target} every {interval_minutes}min")
         return job['id']
     
     def remove_job(self, job_id):
         """Remove a scheduled job."""
         self.jobs = [j for j in self.jobs if j['id'] != job_id]
+        self._wake.set()
         print(f"🗑️ Removed job #{job_id}")
     
     def disable_job(self, job_id):
@@ -56,6 +60,7 @@ class CronScheduler:
         for job in self.jobs:
             if job['id'] == job_id:
                 job['enabled'] = False
+                self._wake.set()
                 print(f"⏸️ Disabled job #{job_id}")
     
     def enable_job(self, job_id):
@@ -63,6 +68,7 @@ class CronScheduler:
         for job in self.jobs:
             if job['id'] == job_id:
                 job['enabled'] = True
+                self._wake.set()
                 print(f"▶️ Enabled job #{job_id}")
     
     def list_jobs(self):
@@ -118,8 +124,11 @@ class CronScheduler:
                     self._run_job(job)
                     job['next_run'] = now + timedelta(minutes=job['interval_minutes'])
             
-            # Check every 30 seconds
-            time.sleep(30)
+            # Sleep until the next job is due (or until the schedule changes)
+            pending = [j['next_run'] for j in self.jobs if j['enabled'] and j['next_run']]
+            timeout = max(0.0, (min(pending) - datetime.now()).total_seconds()) if pending else None
+            self._wake.wait(timeout)
+            self._wake.clear()
         
         print("🛑 Scheduler stopped")
     
@@ -137,6 +146,7 @@ class CronScheduler:
     def stop(self):
         """Stop the scheduler."""
         self.running = False
+        self._wake.set()
         if self.thread:
             self.thread.join(timeout=5)
         print("🛑 Scheduler stopped")
@@ -169,6 +179,7 @@ class CronScheduler:
             if job_data['next_run']:
                 job_data['next_run'] = datetime.fromisoformat(job_data['next_run'])
             self.jobs.append(job_data)
+        self._wake.set()
         
         print(f"📂 Loaded {len(jobs_data)} jobs from {filepath}")
 
@@ -1,2 +1,7 @@
 # Scraper module
-from .async_scraper import run_async_scraper, scrape_async
+# scraper.common is imported by main.py too, which must work without the
+# async extras (aiohttp, aiofiles) installed
+try:
+    from .async_scraper import run_async_scraper, scrape_async
+except ImportError:
+    pass
@@ -9,15 +9,28 @@ import datetime
 import time
 import os
 import random
+import json
+import csv
 from pathlib import Path
-from urllib.parse import urlparse
 import sys
 
 sys.path.insert(0, str(Path(__file__).parent.parent))
 from config import USER_AGENT, MIRRORS, ASYNC_MAX_CONCURRENT, ASYNC_BATCH_SIZE
+from scraper.common import (
+    EMPTY, IMAGE_URL_RE, IMG_EXT_RE, mirror_observed, mirror_order, url_ext
+)
 import subprocess
 import tempfile
 
+# Try importing orjson for faster JSON decoding
+try:
+    import orjson
+    HAS_ORJSON = True
+except ImportError:
+    HAS_ORJSON = False
+
+json_loads = orjson.loads if HAS_ORJSON else json.loads
+
 # Semaphore to limit concurrent requests
 semaphore = None
 
@@ -27,7 +40,7 @@ async def fetch_json(session, url, retries=3):
         try:
             async with session.get(url, timeout=aiohttp.ClientTimeout(total=15)) as response:
                 if response.status == 200:
-                    return await response.json()
+                    return await response.json(loads=json_loads)
                 elif response.status == 429:  # Rate limited
                     await asyncio.sleep(5 * (attempt + 1))
         except Exception as e:
@@ -48,36 +61,45 @@ async def fetch_posts_page(session, base_url, target, after=None, is_user=False,
     
     return await fetch_json(session, url)
 
-async def download_media_async(session, url, save_path):
-    """Download media file asynchronously."""
+# Media bodies are written in up-to-1 MiB reads: each aiofiles write is a
+# thread-pool round trip, so 8 KB chunks cost one hop per 8 KB
+MEDIA_CHUNK = 1 << 20
+
+async def _save_response(response, save_path):
+    """Streams an aiohttp response body to save_path."""
+    async with aiofiles.open(save_path, 'wb') as f:
+        async for chunk in response.content.iter_chunked(MEDIA_CHUNK):
+            await f.write(chunk)
+
+async def download_media_async(session, url, save_path, sem=None):
+    """Download media file asynchronously (sem defaults to the module semaphore)."""
     global semaphore
     
     if os.path.exists(save_path):
         return True
     
-    async with semaphore:
+    async with sem or semaphore:
         try:
             async with session.get(url, timeout=aiohttp.ClientTimeout(total=60)) as response:
                 if response.status == 200:
-                    async with aiofiles.open(save_path, 'wb') as f:
-                        async for chunk in response.content.iter_chunked(8192):
-                            await f.write(chunk)
+                    await _save_response(response, save_path)
                     return True
         except:
             pass
     return False
 
-async def download_reddit_video_with_audio_async(session, video_url, save_path):
+async def download_reddit_video_with_audio_async(session, video_url, save_path, sem=None):
     """
     Downloads Reddit video with audio asynchronously.
     Reddit stores video and audio separately - this combines them using ffmpeg.
+    sem defaults to the module semaphore.
     """
     global semaphore
     
     if os.path.exists(save_path):
         return True
     
-    async with semaphore:
+    async with sem or semaphore:
         try:
             # Find audio URL by replacing video quality with audio
             base_url = video_url.rsplit('/', 1)[0]
@@ -98,9 +120,7 @@ async def download_reddit_video_with_audio_async(session, video_url, save_path):
                 async with session.get(video_url, timeout=aiohttp.ClientTimeout(total=60)) as response:
                     if response.status != 200:
                         return False
-                    async with aiofiles.open(video_temp_path, 'wb') as f:
-                        async for chunk in response.content.iter_chunked(8192):
-                            await f.write(chunk)
+                    await _save_response(response, video_temp_path)
             except:
                 if os.path.exists(video_temp_path):
                     os.unlink(video_temp_path)
@@ -115,9 +135,7 @@ async def download_reddit_video_with_audio_async(session, video_url, save_path):
                             audio_temp = tempfile.NamedTemporaryFile(suffix='_audio.mp4', delete=False)
                             audio_temp_path = audio_temp.name
                             audio_temp.close()
-                            async with aiofiles.open(audio_temp_path, 'wb') as f:
-                                async for chunk in response.content.iter_chunked(8192):
-                                    await f.write(chunk)
+                            await _save_response(response, audio_temp_path)
                             break
                 except:
                     continue
@@ -181,35 +199,42 @@ async def fetch_comments_async(session, permalink):
     return []
 
 def parse_comments_sync(comment_list, post_permalink, depth=0, max_depth=3):
-    """Parse comments (sync helper)."""
+    """Parse comments (sync helper, iterative)."""
     comments = []
     
     if depth > max_depth:
         return comments
     
-    for item in comment_list:
+    # Hot-loop names bound locally instead of looked up per comment
+    fromtimestamp = datetime.datetime.fromtimestamp
+    append = comments.append
+    
+    stack = [(iter(comment_list), depth)]
+    while stack:
+        items, depth = stack[-1]
+        item = next(items, None)
+        if item is None:
+            stack.pop()
+            continue
         if item['kind'] != 't1':
             continue
         
         c = item['data']
-        comments.append({
+        append({
             "post_permalink": post_permalink,
             "comment_id": c.get('id'),
             "parent_id": c.get('parent_id'),
             "author": c.get('author'),
             "body": c.get('body', ''),
             "score": c.get('score', 0),
-            "created_utc": datetime.datetime.fromtimestamp(c.get('created_utc', 0)).isoformat(),
+            "created_utc": fromtimestamp(c.get('created_utc', 0)).isoformat(),
             "depth": depth,
             "is_submitter": c.get('is_submitter', False),
         })
         
         replies = c.get('replies')
-        if replies and isinstance(replies, dict):
-            comments.extend(parse_comments_sync(
-                replies.get('data', {}).get('children', []),
-                post_permalink, depth + 1, max_depth
-            ))
+        if depth < max_depth and replies and isinstance(replies, dict):
+            stack.append((iter(replies.get('data', {}).get('children', [])), depth + 1))
     
     return comments
 
@@ -219,40 +244,49 @@ def extract_media_urls(post_data):
     
     url = post_data.get('url', '')
     
-    if any(ext in url.lower() for ext in ['.jpg', '.jpeg', '.png', '.gif', '.webp']):
+    if IMG_EXT_RE.search(url):
         media["images"].append(url)
     
     if 'i.redd.it' in url:
         media["images"].append(url)
     
     if post_data.get('is_video'):
-        reddit_video = post_data.get('media', {})
-        if reddit_video and 'reddit_video' in reddit_video:
-            video_url = reddit_video['reddit_video'].get('fallback_url', '')
+        reddit_video = (post_data.get('media') or EMPTY).get('reddit_video')
+        if reddit_video:
+            video_url = reddit_video.get('fallback_url')
             if video_url:
                 media["videos"].append(video_url.split('?')[0])
     
-    preview = post_data.get('preview', {})
-    if preview and 'images' in preview:
-        for img in preview['images']:
-            source = img.get('source', {})
-            if source.get('url'):
-                media["images"].append(source['url'].replace('&amp;', '&'))
+    for img in (post_data.get('preview') or EMPTY).get('images', ()):
+        source_url = (img.get('source') or EMPTY).get('url')
+        if source_url:
+            media["images"].append(source_url.replace('&amp;', '&'))
     
     if post_data.get('is_gallery'):
-        gallery_data = post_data.get('gallery_data', {})
-        media_metadata = post_data.get('media_metadata', {})
-        
-        if gallery_data and media_metadata:
-            for item in gallery_data.get('items', []):
-                media_id = item.get('media_id')
-                if media_id and media_id in media_metadata:
-                    meta = media_metadata[media_id]
-                    if meta.get('s', {}).get('u'):
-                        media["galleries"].append(meta['s']['u'].replace('&amp;', '&'))
+        media_metadata = post_data.get('media_metadata')
+        if media_metadata:
+            for item in (post_data.get('gallery_data') or EMPTY).get('items', ()):
+                meta = media_metadata.get(item.get('media_id'))
+                gallery_url = (meta.get('s') or EMPTY).get('u') if meta else None
+                if gallery_url:
+                    media["galleries"].append(gallery_url.replace('&amp;', '&'))
     
     return media
 
+def append_csv(rows, filepath):
+    """Append dict rows to a CSV, in the existing header's column order."""
+    fieldnames = list(rows[0])
+    is_new = not os.path.exists(filepath) or os.path.getsize(filepath) == 0
+    if not is_new:
+        with open(filepath, newline='', encoding='utf-8') as f:
+            fieldnames = next(csv.reader(f), None) or fieldnames
+    
+    with open(filepath, 'a', newline='', encoding='utf-8') as f:
+        writer = csv.DictWriter(f, fieldnames=fieldnames, extrasaction='ignore')
+        if is_new:
+            writer.writeheader()
+        writer.writerows(rows)
+
 def extract_post_data(p):
     """Extract post data from JSON."""
     post_type = "text"
@@ -260,7 +294,7 @@ def extract_post_data(p):
         post_type = "video"
     elif p.get('is_gallery'):
         post_type = "gallery"
-    elif any(ext in p.get('url', '').lower() for ext in ['.jpg', '.jpeg', '.png', '.gif', '.webp']) or 'i.redd.it' in p.get('url', ''):
+    elif IMAGE_URL_RE.search(p.get('url', '')):
         post_type = "image"
     elif p.get('is_self'):
         post_type = "text"
@@ -328,8 +362,8 @@ async def scrape_async(target, limit=100, is_user=False, download_media=True, sc
     posts_file = f"{base_dir}/posts.csv"
     if os.path.exists(posts_file):
         try:
-            df = pd.read_csv(posts_file)
-            seen_permalinks = set(df['permalink'].astype(str).tolist())
+            seen_permalinks = set(pd.read_csv(posts_file, usecols=['permalink'], dtype=object, na_filter=False)['permalink'])
+            seen_permalinks.discard('')
             print(f"📚 Loaded {len(seen_permalinks)} existing posts")
         except:
             pass
@@ -337,17 +371,18 @@ async def scrape_async(target, limit=100, is_user=False, download_media=True, sc
     async with aiohttp.ClientSession(headers={"User-Agent": USER_AGENT}) as session:
         after = None
         total_fetched = 0
+        # Shuffled once so ties between equally ranked mirrors vary per scrape
+        mirrors = MIRRORS.copy()
+        random.shuffle(mirrors)
         
         while total_fetched < limit:
-            # Try mirrors
-            mirrors = MIRRORS.copy()
-            random.shuffle(mirrors)
-            
             data = None
-            for mirror in mirrors:
+            for mirror in mirror_order(mirrors):
                 # Use proper batch size
                 batch_size = min(100, limit - total_fetched)
+                started = time.monotonic()
                 data = await fetch_posts_page(session, mirror, target, after, is_user, batch_size)
+                mirror_observed(mirror, bool(data), time.monotonic() - started)
                 if data:
                     print(f"✅ Fetched from {mirror}")
                     break
@@ -369,11 +404,10 @@ async def scrape_async(target, limit=100, is_user=False, download_media=True, sc
             
             for child in children:
                 p = child['data']
-                post = extract_post_data(p)
-                
-                if post['permalink'] in seen_permalinks:
+                if p.get('permalink') in seen_permalinks:
                     continue
                 
+                post = extract_post_data(p)
                 seen_permalinks.add(post['permalink'])
                 batch_posts.append(post)
                 
@@ -382,7 +416,7 @@ async def scrape_async(target, limit=100, is_user=False, download_media=True, sc
                     media = extract_media_urls(p)
                     
                     for i, img_url in enumerate(media['images'][:5]):
-                        ext = os.path.splitext(urlparse(img_url).path)[1] or '.jpg'
+                        ext = url_ext(img_url)
                         save_path = f"{images_dir}/{post['id']}_{i}{ext}"
                         media_tasks.append(download_media_async(session, img_url, save_path))
                     
@@ -432,20 +466,12 @@ async def scrape_async(target, limit=100, is_user=False, download_media=True, sc
     
     # Save data
     if all_posts:
-        df = pd.DataFrame(all_posts)
-        if os.path.exists(posts_file):
-            df.to_csv(posts_file, mode='a', header=False, index=False)
-        else:
-            df.to_csv(posts_file, index=False)
+        append_csv(all_posts, posts_file)
         print(f"\n💾 Saved {len(all_posts)} posts to {posts_file}")
     
     if all_comments:
         comments_file = f"{base_dir}/comments.csv"
-        df = pd.DataFrame(all_comments)
-        if os.path.exists(comments_file):
-            df.to_csv(comments_file, mode='a', header=False, index=False)
-        else:
-            df.to_csv(comments_file, index=False)
+        append_csv(all_comments, comments_file)
         print(f"💾 Saved {len(all_comments)} comments")
     
     duration = time.time() - start_time
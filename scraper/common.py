@@ -0,0 +1,63 @@
+"""
+Helpers shared by the sync (main.py) and async scrapers - mirror ranking
+and media URL parsing - so the two can't drift apart.
+"""
+import random
+import re
+
+# Mirrors are tried cheapest first: EWMA listing latency / EWMA success rate,
+# learned across scrapes in this process (both scrapers share the stats).
+# MIRROR_EXPLORE of the time a random other mirror goes first so a recovered
+# mirror can win its place back.
+MIRROR_EWMA_ALPHA = 0.2
+MIRROR_EXPLORE = 0.1
+MIRROR_STATS = {}
+
+def _mirror_stats(base_url):
+    return MIRROR_STATS.setdefault(base_url, {"latency": 0.5, "success": 1.0})
+
+def _mirror_cost(base_url):
+    stats = _mirror_stats(base_url)
+    return stats["latency"] / max(stats["success"], 0.01)
+
+def mirror_order(mirrors):
+    """Mirrors to try for the next listing page, healthiest first."""
+    mirrors = sorted(mirrors, key=_mirror_cost)
+    if len(mirrors) > 1 and random.random() < MIRROR_EXPLORE:
+        mirrors.insert(0, mirrors.pop(random.randrange(1, len(mirrors))))
+    return mirrors
+
+def mirror_observed(base_url, ok, latency):
+    """Fold one listing request into the mirror's latency/success EWMAs."""
+    stats = _mirror_stats(base_url)
+    alpha = MIRROR_EWMA_ALPHA
+    stats["latency"] += alpha * (latency - stats["latency"])
+    stats["success"] += alpha * ((1.0 if ok else 0.0) - stats["success"])
+
+# Image extension anywhere in the URL, case-insensitive (no per-call lower())
+IMG_EXT_RE = re.compile(r'\.(?:jpe?g|png|gif|webp)', re.IGNORECASE)
+# Same, or hosted on i.redd.it
+IMAGE_URL_RE = re.compile(r'\.(?:jpe?g|png|gif|webp)|i\.redd\.it', re.IGNORECASE)
+
+def url_ext(url, default='.jpg'):
+    """os.path.splitext(urlparse(url).path)[1] via plain string scans, or default."""
+    end = len(url)
+    for sep in '?#':
+        cut = url.find(sep, 0, end)
+        if cut >= 0:
+            end = cut
+    
+    scheme = url.find('://', 0, end)
+    path_start = url.find('/', scheme + 3 if scheme >= 0 else 0, end)
+    if path_start < 0:
+        return default
+    
+    name_start = url.rfind('/', path_start, end) + 1
+    while name_start < end and url[name_start] == '.':
+        name_start += 1
+    dot = url.rfind('.', name_start, end)
+    return url[dot:end] if dot >= 0 else default
+
+# Shared read-only default for missing nested objects (never mutated), so
+# lookups don't allocate a throwaway {} per call
+EMPTY = {}
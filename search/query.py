@@ -2,9 +2,323 @@
 Search & Query module - Search and filter scraped data
 """
 import pandas as pd
+import numpy as np
 from pathlib import Path
 from datetime import datetime
-import re
+from concurrent.futures import ThreadPoolExecutor
+from collections import OrderedDict
+from itertools import repeat
+import os
+import sys
+import threading
+
+# Try importing duckdb to filter CSVs in one SQL scan instead of loading them whole
+try:
+    import duckdb
+    HAS_DUCKDB = True
+except ImportError:
+    HAS_DUCKDB = False
+
+# Try importing pyarrow so advanced_search can read columnar posts.parquet
+try:
+    import pyarrow
+    HAS_PYARROW = True
+except ImportError:
+    HAS_PYARROW = False
+
+# CSVs this big are streamed in SEARCH_CHUNK-row chunks (and never cached),
+# stopping as soon as limit matches are found
+STREAM_MIN_BYTES = 64 * 1024 * 1024
+SEARCH_CHUNK = 100000
+
+# Files search_all_data searches at once
+SEARCH_WORKERS = min(8, os.cpu_count() or 1)
+
+# Columns searched when no specific column is given
+TEXT_COLUMNS = ['title', 'selftext', 'body']
+
+# Parsed CSVs kept for repeated searches: one entry per path (a rewritten
+# file replaces its old version), least recently used dropped first once
+# the cached files add up to more than CSV_CACHE_BYTES on disk
+CSV_CACHE_BYTES = 256 * 1024 * 1024
+_CSV_CACHE = OrderedDict()
+_CSV_CACHE_LOCK = threading.Lock()
+
+def _csv_key(filepath):
+    """(path, mtime, size) cache key for a CSV."""
+    path = str(filepath)
+    stat = os.stat(path)
+    return path, stat.st_mtime_ns, stat.st_size
+
+def _cache_entry(key):
+    """
+    The cached {'key', 'df', 'created'} entry for one version of a CSV,
+    parsing the file when its path is new or its mtime/size changed.
+    """
+    path = key[0]
+    with _CSV_CACHE_LOCK:
+        entry = _CSV_CACHE.get(path)
+        if entry is not None and entry['key'] == key:
+            _CSV_CACHE.move_to_end(path)
+            return entry
+    
+    entry = {'key': key, 'df': pd.read_csv(path), 'created': None}
+    with _CSV_CACHE_LOCK:
+        _CSV_CACHE[path] = entry
+        _CSV_CACHE.move_to_end(path)
+        total = sum(e['key'][2] for e in _CSV_CACHE.values())
+        while total > CSV_CACHE_BYTES and len(_CSV_CACHE) > 1:
+            _, dropped = _CSV_CACHE.popitem(last=False)
+            total -= dropped['key'][2]
+    return entry
+
+def _created_cached(key):
+    """_created_ns of a cached CSV's created_utc, parsed once per version."""
+    entry = _cache_entry(key)
+    if entry['created'] is None:
+        entry['created'] = _created_ns(entry['df']['created_utc'])
+    return entry['created']
+
+def _read_csv(filepath):
+    """
+    pd.read_csv through the cache above, so repeated searches skip
+    re-parsing unchanged files. Returns a shallow copy; callers may add
+    columns but must not modify values in place.
+    """
+    return _cache_entry(_csv_key(filepath))['df'].copy(deep=False)
+
+def clear_cache():
+    """Drop all cached CSVs (e.g. after rewriting files within one mtime tick)."""
+    with _CSV_CACHE_LOCK:
+        _CSV_CACHE.clear()
+    with _DUCKDB_LOCK:
+        _DUCKDB_SOURCES.clear()
+
+# int64 value numpy uses for NaT
+_NAT = np.iinfo(np.int64).min
+
+def _created_ns(values):
+    """
+    created_utc values as int64 epoch nanoseconds (NaT where unparseable).
+    Naive timestamps are taken as-is (read as UTC), so they compare by
+    their wall-clock value like the ISO strings they are stored as.
+    """
+    parsed = pd.DatetimeIndex(pd.to_datetime(values, errors='coerce', format='ISO8601', utc=True))
+    # pandas >= 2 may infer a coarser unit; bounds are in nanoseconds
+    if hasattr(parsed, 'as_unit'):
+        parsed = parsed.as_unit('ns')
+    return parsed.asi8
+
+def _bound_ns(value):
+    """A start/end date as int64 epoch nanoseconds, on the same scale as _created_ns."""
+    ts = pd.Timestamp(value)
+    ts = ts.tz_localize('UTC') if ts.tzinfo is None else ts.tz_convert('UTC')
+    return ts.value
+
+def _date_mask(column, created, start_date, end_date):
+    """
+    start_date <= created_utc <= end_date as a numpy mask, compared as
+    int64 timestamps. Falls back to comparing strings, as search used to,
+    when a bound or the column can't be parsed as dates.
+    """
+    try:
+        start = _bound_ns(start_date) if start_date else None
+        end = _bound_ns(end_date) if end_date else None
+        if created is None:
+            created = _created_ns(column)
+    except (ValueError, TypeError):
+        mask = np.ones(len(column), dtype=bool)
+        if start_date:
+            mask &= _as_mask(column >= start_date)
+        if end_date:
+            mask &= _as_mask(column <= end_date)
+        return mask
+    
+    mask = created != _NAT
+    if start is not None:
+        mask &= created >= start
+    if end is not None:
+        mask &= created <= end
+    return mask
+
+def _contains(series, pattern, regex=True):
+    """
+    Case-insensitive str.contains for one column.
+    
+    String columns are matched as they are: on Arrow-backed strings pandas
+    runs pyarrow's match_substring(_regex) kernels over the UTF-8 buffers,
+    so object columns are moved to Arrow first when pyarrow is available.
+    Anything else is stringified first, as before.
+    
+    RE2 rejects some Python regex syntax (lookarounds, backreferences);
+    those patterns are retried on object strings with Python's re.
+    """
+    if series.dtype == object or not pd.api.types.is_string_dtype(series.dtype):
+        series = series.astype(str)
+        if HAS_PYARROW and series.dtype == object:
+            series = series.astype(pd.ArrowDtype(pyarrow.string()))
+    try:
+        return series.str.contains(pattern, case=False, na=False, regex=regex)
+    except Exception as e:
+        if not (regex and HAS_PYARROW and isinstance(e, pyarrow.ArrowInvalid)):
+            raise
+    return series.astype(object).str.contains(pattern, case=False, na=False, regex=True)
+
+def _as_mask(cond):
+    """Boolean Series -> numpy mask, missing values counting as False."""
+    return cond.to_numpy(dtype=bool, na_value=False)
+
+def _sql_ident(name):
+    """Quotes a column name for DuckDB SQL."""
+    return '"' + name.replace('"', '""') + '"'
+
+# One in-memory DuckDB database for the process; each query runs on its
+# own cursor so search_all_data's threads don't share one
+_DUCKDB_CON = None
+_DUCKDB_LOCK = threading.Lock()
+
+def _duckdb_cursor():
+    global _DUCKDB_CON
+    with _DUCKDB_LOCK:
+        if _DUCKDB_CON is None:
+            _DUCKDB_CON = duckdb.connect(':memory:')
+            # Naive created_utc values are UTC, as _created_ns reads them
+            _DUCKDB_CON.execute("SET GLOBAL TimeZone='UTC'")
+        return _DUCKDB_CON.cursor()
+
+# path -> (cache key, _duckdb_source result) for the latest version sniffed
+_DUCKDB_SOURCES = {}
+
+def _duckdb_source(key):
+    """(read_csv_auto SQL, column names) for one version of a CSV, sniffed once."""
+    with _DUCKDB_LOCK:
+        cached = _DUCKDB_SOURCES.get(key[0])
+    if cached is not None and cached[0] == key:
+        return cached[1]
+    
+    path = key[0].replace("'", "''")
+    source = f"read_csv_auto('{path}')"
+    cur = _duckdb_cursor()
+    try:
+        columns = frozenset(row[0] for row in cur.execute(f"DESCRIBE SELECT * FROM {source}").fetchall())
+    finally:
+        cur.close()
+    if 'created_utc' in columns:
+        # Keep timestamps as the ISO strings pandas would return
+        source = f"read_csv_auto('{path}', types={{'created_utc': 'VARCHAR'}})"
+    with _DUCKDB_LOCK:
+        _DUCKDB_SOURCES[key[0]] = (key, (source, columns))
+    return source, columns
+
+def _search_csv_duckdb(filepath, query, column, min_score, max_score,
+                       start_date, end_date, post_type, author, limit):
+    """
+    search_csv as a single DuckDB query: the predicates and LIMIT are pushed
+    into the CSV scan, so only matching rows are ever materialized.
+    """
+    source, columns = _duckdb_source(_csv_key(filepath))
+    con = _duckdb_cursor()
+    try:
+        where = []
+        params = []
+        
+        # Text search (case-insensitive regex, like str.contains)
+        if query:
+            if column and column in columns:
+                search_cols = [column]
+            else:
+                search_cols = [c for c in TEXT_COLUMNS if c in columns]
+            if search_cols:
+                where.append('(' + ' OR '.join(
+                    f"regexp_matches(CAST({_sql_ident(c)} AS VARCHAR), ?, 'i')" for c in search_cols
+                ) + ')')
+                params.extend([query] * len(search_cols))
+            else:
+                where.append('FALSE')
+        
+        if 'score' in columns:
+            if min_score is not None:
+                where.append('score >= ?')
+                params.append(min_score)
+            if max_score is not None:
+                where.append('score <= ?')
+                params.append(max_score)
+        
+        # Dates compare as epoch nanoseconds like _date_mask (unparseable
+        # rows never match), or as strings when a bound isn't a date
+        if 'created_utc' in columns and (start_date or end_date):
+            try:
+                bounds = [_bound_ns(value) if value else None for value in (start_date, end_date)]
+                created = 'epoch_ns(TRY_CAST(created_utc AS TIMESTAMPTZ))'
+                where.append(f'{created} IS NOT NULL')
+            except (ValueError, TypeError):
+                bounds = [str(value) if value else None for value in (start_date, end_date)]
+                created = 'created_utc'
+            if bounds[0] is not None:
+                where.append(f'{created} >= ?')
+                params.append(bounds[0])
+            if bounds[1] is not None:
+                where.append(f'{created} <= ?')
+                params.append(bounds[1])
+        
+        if post_type and 'post_type' in columns:
+            where.append('post_type = ?')
+            params.append(post_type)
+        
+        if author and 'author' in columns:
+            where.append('author = ?')
+            params.append(author)
+        
+        sql = f"SELECT * FROM {source}"
+        if where:
+            sql += " WHERE " + " AND ".join(where)
+        sql += " LIMIT ?"
+        params.append(int(limit))
+        
+        return con.execute(sql, params).df()
+    finally:
+        con.close()
+
+def _search_mask(df, query, column, min_score, max_score, start_date, end_date, post_type, author,
+                 created=None):
+    """
+    search_csv's filters as one numpy mask over df's rows.
+    created optionally gives df's created_utc already parsed by _created_ns.
+    """
+    # All filters AND into one mask, so the frame is sliced once
+    mask = np.ones(len(df), dtype=bool)
+    
+    # Text search
+    if query:
+        if column and column in df.columns:
+            mask &= _as_mask(_contains(df[column], query))
+        else:
+            # Search in all text columns
+            text_mask = np.zeros(len(df), dtype=bool)
+            for col in TEXT_COLUMNS:
+                if col in df.columns:
+                    text_mask |= _as_mask(_contains(df[col], query))
+            mask &= text_mask
+    
+    # Score filter
+    if min_score is not None and 'score' in df.columns:
+        mask &= _as_mask(df['score'] >= min_score)
+    if max_score is not None and 'score' in df.columns:
+        mask &= _as_mask(df['score'] <= max_score)
+    
+    # Date filter
+    if (start_date or end_date) and 'created_utc' in df.columns:
+        mask &= _date_mask(df['created_utc'], created, start_date, end_date)
+    
+    # Post type filter
+    if post_type and 'post_type' in df.columns:
+        mask &= _as_mask(df['post_type'] == post_type)
+    
+    # Author filter
+    if author and 'author' in df.columns:
+        mask &= _as_mask(df['author'] == author)
+    
+    return mask
 
 def search_csv(filepath, query=None, column=None, min_score=None, max_score=None,
                start_date=None, end_date=None, post_type=None, author=None, limit=50):
@@ -30,43 +344,39 @@ def search_csv(filepath, query=None, column=None, min_score=None, max_score=None
         print(f"❌ File not found: {filepath}")
         return pd.DataFrame()
     
-    df = pd.read_csv(filepath)
+    if HAS_DUCKDB:
+        try:
+            return _search_csv_duckdb(filepath, query, column, min_score, max_score,
+                                      start_date, end_date, post_type, author, limit)
+        except duckdb.Error:
+            pass  # e.g. a file DuckDB can't sniff; the pandas path below handles it
     
-    # Text search
-    if query:
-        if column and column in df.columns:
-            mask = df[column].astype(str).str.contains(query, case=False, na=False)
-        else:
-            # Search in all text columns
-            text_cols = ['title', 'selftext', 'body']
-            mask = pd.Series([False] * len(df))
-            for col in text_cols:
-                if col in df.columns:
-                    mask |= df[col].astype(str).str.contains(query, case=False, na=False)
-        df = df[mask]
+    filters = (query, column, min_score, max_score, start_date, end_date, post_type, author)
     
-    # Score filter
-    if min_score is not None and 'score' in df.columns:
-        df = df[df['score'] >= min_score]
-    if max_score is not None and 'score' in df.columns:
-        df = df[df['score'] <= max_score]
+    if os.path.getsize(filepath) < STREAM_MIN_BYTES:
+        key = _csv_key(filepath)
+        df = _cache_entry(key)['df'].copy(deep=False)
+        # Parsed timestamps are cached alongside the frame
+        created = None
+        if (start_date or end_date) and 'created_utc' in df.columns:
+            try:
+                created = _created_cached(key)
+            except (ValueError, TypeError):
+                pass
+        # Filter and head(limit) in one selection
+        return df.iloc[np.flatnonzero(_search_mask(df, *filters, created=created))[:limit]]
     
-    # Date filter
-    if 'created_utc' in df.columns:
-        if start_date:
-            df = df[df['created_utc'] >= start_date]
-        if end_date:
-            df = df[df['created_utc'] <= end_date]
-    
-    # Post type filter
-    if post_type and 'post_type' in df.columns:
-        df = df[df['post_type'] == post_type]
-    
-    # Author filter
-    if author and 'author' in df.columns:
-        df = df[df['author'] == author]
+    # Large file: parse in chunks and stop once limit matches are found
+    found = []
+    remaining = limit
+    for chunk in pd.read_csv(filepath, chunksize=SEARCH_CHUNK):
+        hits = chunk.iloc[np.flatnonzero(_search_mask(chunk, *filters))[:remaining]]
+        found.append(hits)
+        remaining -= len(hits)
+        if remaining <= 0:
+            break
     
-    return df.head(limit)
+    return pd.concat(found) if found else pd.DataFrame()
 
 def search_all_data(data_dir='data', query=None, **kwargs):
     """
@@ -87,24 +397,41 @@ def search_all_data(data_dir='data', query=None, **kwargs):
         print(f"❌ Data directory not found: {data_dir}")
         return results
     
-    # Find all posts.csv files
+    # Find all posts.csv files, plus legacy top-level CSVs
+    sources = []
     for sub_dir in data_path.iterdir():
         if sub_dir.is_dir():
             posts_file = sub_dir / 'posts.csv'
             if posts_file.exists():
-                df = search_csv(str(posts_file), query=query, **kwargs)
-                if len(df) > 0:
-                    results[sub_dir.name] = df
-    
-    # Also check legacy format
+                sources.append((sub_dir.name, posts_file, False))
     for csv_file in data_path.glob('*.csv'):
-        if csv_file.stem not in [r.replace('r_', '').replace('u_', '') for r in results.keys()]:
-            df = search_csv(str(csv_file), query=query, **kwargs)
-            if len(df) > 0:
-                results[csv_file.stem] = df
+        sources.append((csv_file.stem, csv_file, True))
+    
+    # Files are searched concurrently: CSV parsing, Arrow matching and
+    # DuckDB scans all release the GIL
+    with ThreadPoolExecutor(max_workers=SEARCH_WORKERS) as pool:
+        found = list(pool.map(lambda src: search_csv(str(src[1]), query=query, **kwargs), sources))
+    
+    # Matched names without their r_/u_ prefix, for the legacy-file check
+    matched = set()
+    for (name, _, legacy), df in zip(sources, found):
+        if len(df) == 0:
+            continue
+        # Legacy files only count when no scrape folder already matched
+        if legacy and name in matched:
+            continue
+        results[name] = df
+        matched.add(name.replace('r_', '').replace('u_', ''))
     
     return results
 
+def _column_values(df, columns, default):
+    """Values of the first of columns present in df, else default for every row."""
+    for col in columns:
+        if col in df.columns:
+            return df[col].to_numpy()
+    return repeat(default, len(df))
+
 def print_search_results(results, show_preview=True):
     """Pretty print search results."""
     total = sum(len(df) for df in results.values())
@@ -113,19 +440,76 @@ def print_search_results(results, show_preview=True):
     print("=" * 70)
     
     for source, df in results.items():
-        print(f"\n📁 {source} ({len(df)} matches)")
-        print("-" * 50)
+        # One write per source instead of a print() per line
+        lines = [f"\n📁 {source} ({len(df)} matches)", "-" * 50]
+        
+        # Plain column arrays instead of a Series per row from iterrows()
+        titles = _column_values(df, ('title', 'body'), 'N/A')
+        scores = _column_values(df, ('score',), 0)
+        selftexts = _column_values(df, ('selftext',) if show_preview else (), None)
         
-        for _, row in df.iterrows():
-            title = str(row.get('title', row.get('body', 'N/A')))[:60]
-            score = row.get('score', 0)
-            date = str(row.get('created_utc', ''))[:10]
-            
-            print(f"  [{score:>4}⬆] {title}...")
-            if show_preview and 'selftext' in row and row['selftext']:
-                preview = str(row['selftext'])[:100].replace('\n', ' ')
-                print(f"         └─ {preview}...")
-            print()
+        for title, score, selftext in zip(titles, scores, selftexts):
+            lines.append(f"  [{score:>4}⬆] {str(title)[:60]}...")
+            if selftext:
+                preview = str(selftext)[:100].replace('\n', ' ')
+                lines.append(f"         └─ {preview}...")
+            lines.append("")
+        
+        sys.stdout.write("\n".join(lines) + "\n")
+    sys.stdout.flush()
+
+def _top_rows(df, column, ascending, n):
+    """
+    df.sort_values(column).head(n), using pandas' O(N) nlargest/nsmallest
+    partial selection for numeric and datetime columns without NaNs.
+    Anything else (strings, missing values) takes the full sort.
+    """
+    key = df[column]
+    if (len(df) > n and df.index.is_unique and not key.hasnans
+            and not pd.api.types.is_bool_dtype(key)
+            and (pd.api.types.is_numeric_dtype(key) or pd.api.types.is_datetime64_any_dtype(key))):
+        # Arrow timestamps (naive or UTC) have no nlargest; their int64
+        # epoch values order the same
+        if isinstance(key.dtype, pd.ArrowDtype) and pd.api.types.is_datetime64_any_dtype(key):
+            key = key.astype('int64')
+        try:
+            top = key.nsmallest(n) if ascending else key.nlargest(n)
+            return df.loc[top.index]
+        except TypeError:
+            pass
+    
+    return df.sort_values(column, ascending=ascending).head(n)
+
+def _search_columns(query, sort_by, filters):
+    """Columns advanced_search needs to filter and sort."""
+    columns = {sort_by}
+    if query:
+        columns.update(['title', 'selftext'])
+    for col, key in (('score', 'min_score'), ('author', 'author'), ('post_type', 'post_type')):
+        if filters.get(key):
+            columns.add(col)
+    return sorted(columns)
+
+def _full_rows(hits, folders):
+    """
+    Replaces projected hit rows with the complete posts, keeping hit order.
+    Only the posts.parquet row groups holding hits are decoded.
+    """
+    from export.parquet import read_post_rows
+    
+    parts = []
+    for source, rows in hits.groupby('source', sort=False)['_row']:
+        part = read_post_rows(folders[source], rows.to_numpy())
+        part.index = rows.index
+        part['source'] = source
+        parts.append(part)
+    
+    if not parts:
+        # No hits: still return the full set of columns
+        empty = read_post_rows(next(iter(folders.values())), [])
+        empty['source'] = pd.Series(dtype=object)
+        return empty
+    return pd.concat(parts).loc[hits.index]
 
 def advanced_search(data_dir='data', query=None, regex=False, sort_by='score', 
                    ascending=False, **kwargs):
@@ -141,16 +525,30 @@ def advanced_search(data_dir='data', query=None, regex=False, sort_by='score',
         **kwargs: Additional filters
     
     Returns:
-        Combined DataFrame of all results
+        Combined DataFrame of all results. With pyarrow installed it is read
+        from posts.parquet, so columns are Arrow-backed (created_utc a UTC
+        timestamp, score and counts int32) rather than the CSV's strings.
     """
     all_results = []
     data_path = Path(data_dir)
+    folders = {}
+    
+    # With pyarrow, filter and sort on just the columns involved, read from
+    # posts.parquet; full rows are read afterwards for the hits only
+    if HAS_PYARROW:
+        from export.parquet import read_posts
+        columns = _search_columns(query, sort_by, kwargs)
     
     for sub_dir in data_path.iterdir():
         if sub_dir.is_dir():
             posts_file = sub_dir / 'posts.csv'
             if posts_file.exists():
-                df = pd.read_csv(posts_file)
+                if HAS_PYARROW:
+                    df = read_posts(sub_dir, columns)
+                    df['_row'] = range(len(df))
+                    folders[sub_dir.name] = sub_dir
+                else:
+                    df = _read_csv(posts_file)
                 df['source'] = sub_dir.name
                 all_results.append(df)
     
@@ -159,52 +557,119 @@ def advanced_search(data_dir='data', query=None, regex=False, sort_by='score',
     
     combined = pd.concat(all_results, ignore_index=True)
     
-    # Apply query
+    # Apply query and filters as one mask, so the frame is sliced once
+    mask = np.ones(len(combined), dtype=bool)
     if query:
-        if regex:
-            pattern = query
-        else:
-            pattern = re.escape(query)
-        
-        mask = pd.Series([False] * len(combined))
+        text_mask = np.zeros(len(combined), dtype=bool)
         for col in ['title', 'selftext']:
             if col in combined.columns:
-                mask |= combined[col].astype(str).str.contains(pattern, case=False, na=False, regex=True)
-        combined = combined[mask]
+                text_mask |= _as_mask(_contains(combined[col], query, regex=regex))
+        mask &= text_mask
     
-    # Apply other filters
     if kwargs.get('min_score') and 'score' in combined.columns:
-        combined = combined[combined['score'] >= kwargs['min_score']]
+        mask &= _as_mask(combined['score'] >= kwargs['min_score'])
     
     if kwargs.get('author') and 'author' in combined.columns:
-        combined = combined[combined['author'] == kwargs['author']]
+        mask &= _as_mask(combined['author'] == kwargs['author'])
     
     if kwargs.get('post_type') and 'post_type' in combined.columns:
-        combined = combined[combined['post_type'] == kwargs['post_type']]
+        mask &= _as_mask(combined['post_type'] == kwargs['post_type'])
     
-    # Sort
-    if sort_by in combined.columns:
-        combined = combined.sort_values(sort_by, ascending=ascending)
+    if not mask.all():
+        combined = combined[mask]
     
+    # Sort, keeping only the top limit rows
     limit = kwargs.get('limit', 100)
-    return combined.head(limit)
+    if sort_by in combined.columns:
+        combined = _top_rows(combined, sort_by, ascending, limit)
+    else:
+        combined = combined.head(limit)
+    if folders:
+        combined = _full_rows(combined, folders)
+    return combined
 
 def get_top_posts(data_dir='data', n=10, by='score'):
-    """Get top N posts across all scraped data."""
+    """Get top N posts across all scraped data (dtypes as in advanced_search)."""
     df = advanced_search(data_dir, sort_by=by, ascending=False, limit=n)
     return df
 
 def get_recent_posts(data_dir='data', n=10):
-    """Get most recent posts across all scraped data."""
+    """Get most recent posts across all scraped data (dtypes as in advanced_search)."""
     df = advanced_search(data_dir, sort_by='created_utc', ascending=False, limit=n)
     return df
 
 def find_author_posts(data_dir='data', author=None):
-    """Find all posts by a specific author."""
-    return advanced_search(data_dir, author=author, limit=1000)
+    """Find all posts by a specific author (dtypes as in advanced_search)."""
+    if not author or not HAS_PYARROW:
+        return advanced_search(data_dir, author=author, limit=1000)
+    
+    # The author predicate goes into each posts.parquet scan, so only that
+    # author's rows are ever read
+    import pyarrow.parquet as pq
+    from export.parquet import read_posts, sync_posts_parquet
+    
+    frames = []
+    for sub_dir in Path(data_dir).iterdir():
+        if sub_dir.is_dir() and (sub_dir / 'posts.csv').exists():
+            # No author column, or one typed double because every author
+            # was blank: no row can match
+            schema = pq.read_schema(sync_posts_parquet(sub_dir))
+            if 'author' not in schema.names:
+                continue
+            author_type = schema.field('author').type
+            if not (pyarrow.types.is_string(author_type) or pyarrow.types.is_large_string(author_type)):
+                continue
+            try:
+                df = read_posts(sub_dir, filters=[('author', '==', author)])
+            except pyarrow.ArrowException as e:
+                print(f"⚠️ Skipping {sub_dir.name}: {e}")
+                continue
+            if len(df) > 0:
+                df['source'] = sub_dir.name
+                frames.append(df)
+    
+    if not frames:
+        return pd.DataFrame()
+    
+    combined = pd.concat(frames, ignore_index=True)
+    if 'score' in combined.columns:
+        return _top_rows(combined, 'score', False, 1000)
+    return combined.head(1000)
+
+def _stream_export(frames, output_path, format):
+    """
+    Writes frames one after another as a single CSV or JSON records file,
+    without concatenating them first. Columns are the union across frames,
+    in first-seen order, as pd.concat would give.
+    """
+    columns = list(dict.fromkeys(col for df in frames for col in df.columns))
+    
+    if format == 'csv':
+        with open(output_path, 'w', newline='', encoding='utf-8') as f:
+            for i, df in enumerate(frames):
+                df.reindex(columns=columns).to_csv(f, index=False, header=(i == 0))
+    else:
+        with open(output_path, 'w', encoding='utf-8') as f:
+            f.write('[')
+            first = True
+            for df in frames:
+                if len(df) == 0:
+                    continue
+                # Each frame's records without its enclosing [ ]
+                records = df.reindex(columns=columns).to_json(orient='records', indent=2)
+                f.write(('' if first else ',') + records[1:-2])
+                first = False
+            f.write('\n]' if not first else ']')
 
 def export_search_results(results, output_path, format='csv'):
     """Export search results to file."""
+    if isinstance(results, dict) and format in ('csv', 'json') and results:
+        # Stream each source's frame to the file instead of concatenating
+        frames = list(results.values())
+        _stream_export(frames, output_path, format)
+        print(f"💾 Exported {sum(len(df) for df in frames)} results to {output_path}")
+        return
+    
     if isinstance(results, dict):
         combined = pd.concat(results.values(), ignore_index=True)
     else: